@@ -1,6 +1,10 @@
 import streamlit as st
 import datetime
-from utils import run_query, execute_insert, get_time_slots, check_conflict
+from utils import execute_insert, get_time_slots, check_conflict
+from location_catalog import location_catalog
+from image_pipeline import process_poster
+from availability import find_free_windows
+from room_search import room_index, search_rooms
 
 st.title("📝 Request a New Event")
 st.markdown("Please fill out the details below. All events require **Admin Approval** before they are confirmed.")
@@ -13,11 +17,38 @@ with st.expander("ℹ️ Read: Guidelines for Approval", expanded=False):
     """)
 
 try:
-    localtions_data = run_query("SELECT location_id, loc_name FROM Location WHERE loc_status != 'Unavailable'")
-    location_options = {row[1]: row[0] for row in localtions_data}
+    location_options = location_catalog().options(available_only=True)
 except:
     location_options = {}
 
+with st.expander("🔎 Find a Free Room", expanded=False):
+    with st.form("room_search_form"):
+        r1, r2, r3, r4, r5 = st.columns([2, 2, 2, 2, 2])
+        try:
+            room_types = room_index().types
+        except Exception:
+            room_types = []
+        search_type = r1.selectbox("Type", ["Any"] + room_types)
+        search_capacity = r2.number_input("Seats at least", min_value=0, step=10)
+        search_date = r3.date_input("Date", datetime.date.today(), key="room_search_date")
+        search_start = r4.selectbox("From", get_time_slots(), index=52, key="room_search_start")
+        search_end = r5.selectbox("To", get_time_slots(), index=68, key="room_search_end")
+        search_btn = st.form_submit_button("Search Rooms")
+
+    if search_btn:
+        search_start_dt = datetime.datetime.combine(search_date, datetime.datetime.strptime(search_start, "%I:%M %p").time())
+        search_end_dt = datetime.datetime.combine(search_date, datetime.datetime.strptime(search_end, "%I:%M %p").time())
+        if search_end_dt <= search_start_dt:
+            st.error("⚠️ 'To' must be after 'From'.")
+        else:
+            free_rooms = search_rooms(search_start_dt, search_end_dt,
+                                      None if search_type == "Any" else search_type, search_capacity or None)
+            if free_rooms.empty:
+                st.info("No matching rooms are free at that time.")
+            else:
+                st.caption(f"{len(free_rooms)} free room(s), best fit first")
+                st.dataframe(free_rooms.drop(columns=["ID"]), use_container_width=True, hide_index=True)
+
 with st.container(border=True):
     with st.form("add_event_form"):
         st.subheader("Event Details")
@@ -70,24 +101,36 @@ with st.container(border=True):
                     st.error("⚠️ End Time cannot be before Start Time.")
                 elif check_conflict(final_location_id, final_start_dt, final_end_dt):
                     st.error(f"❌ CONFLICT: '{selected_location_name}' is already booked for this time slot! Please choose another time or location.")
+                    suggestions = find_free_windows(final_location_id, final_end_dt - final_start_dt, final_start_dt)
+                    if suggestions:
+                        st.info("💡 Next available times at this location:\n"
+                                + "\n".join(f"- {s:%a, %b %d %Y}: {s:%I:%M %p} – {e:%I:%M %p}" if s.date() == e.date()
+                                             else f"- {s:%a, %b %d %Y %I:%M %p} – {e:%a, %b %d %Y %I:%M %p}"
+                                             for s, e in suggestions))
+                    else:
+                        st.info("No free time of this length in the next 14 days at this location.")
                 else:
-                    img_data = None
+                    img_data, thumb_data = None, None
                     if uploaded_file is not None:
-                        img_data = uploaded_file.read()
+                        try:
+                            img_data, thumb_data = process_poster(uploaded_file.getvalue())
+                        except ValueError:
+                            st.error("⚠️ The uploaded poster could not be read. Please upload a PNG or JPG image.")
+                            st.stop()
 
                     sql_query = """
                         INSERT INTO Event
                         (location_id, evn_name, evn_start_date, evn_end_date, 
-                         evn_organizer, evn_description, evn_type, evn_status, evn_image)
+                         evn_organizer, evn_description, evn_type, evn_status, evn_image, evn_thumb, evn_created_at)
                         OUTPUT INSERTED.event_id
-                        VALUES (?,?,?,?,?,?,?,?,?)
+                        VALUES (?,?,?,?,?,?,?,?,?,?,GETDATE())
                     """
                     params = (
                         final_location_id, new_evn_name, final_start_dt, final_end_dt,
-                        new_evn_organizer, new_evn_desc, new_evn_type, 'Pending', img_data
+                        new_evn_organizer, new_evn_desc, new_evn_type, 'Pending', img_data, thumb_data
                     )
                     
-                    new_id = execute_insert(sql_query, params)
+                    new_id = execute_insert(sql_query, params, check_booking=True)
                     
                     if new_id:
                         st.balloons()
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import pyodbc
 from utils import run_query, execute_update
+from location_catalog import refresh_location_catalog
 
 st.set_page_config(page_title="Add Location", layout="wide")
 st.title("Add Location")
@@ -36,4 +37,5 @@ with st.form("add_location_form"):
                       new_localtion_status, new_localtion_type, new_localtion_ct_person, new_localtion_ct_phone)
             
             if execute_update(sql_query,params):
+                refresh_location_catalog()
                 st.success(f"Success! Event '{new_localtion_name}' has been added.")
\ No newline at end of file
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+from cache import VersionedCache
+from utils import iter_query
+
+SNAPSHOT_SQL = """
+    SELECT E.evn_status, E.evn_start_date, E.evn_end_date, E.evn_created_at, L.loc_name
+    FROM Event E LEFT JOIN Location L ON E.location_id = L.location_id
+"""
+
+# A single entry (the latest result set), so no byte budget is needed.
+_analytics_cache = VersionedCache(("Event", "Location"), name="analytics", shared=True)
+
+
+def load_snapshot():
+    # One narrow pass over Event into columnar form: categoricals for the text columns,
+    # datetime64 for the dates. Submission falls back to the start date for rows
+    # created before evn_created_at existed.
+    rows = list(iter_query(SNAPSHOT_SQL, batch_size=5000))
+    status, start, end, created, location = zip(*rows) if rows else ((),) * 5
+    snap = pd.DataFrame({
+        "status": pd.Categorical(status),
+        "start": pd.to_datetime(pd.Series(start, dtype=object)),
+        "end": pd.to_datetime(pd.Series(end, dtype=object)),
+        "created": pd.to_datetime(pd.Series(created, dtype=object)),
+        "location": pd.Categorical(pd.Series(location, dtype=object).fillna("Unassigned")),
+    })
+    snap["submitted"] = snap["created"].fillna(snap["start"])
+    return snap
+
+
+def _week(dates):
+    return dates.dt.to_period("W-SUN").dt.start_time
+
+
+def requests_per_week(snap):
+    if snap.empty:
+        return pd.DataFrame(columns=["Week", "Status", "Requests"])
+    counts = snap.groupby([_week(snap["submitted"]), snap["status"]], observed=True).size()
+    return counts.rename_axis(["Week", "Status"]).reset_index(name="Requests")
+
+
+def approval_rate(snap):
+    decided = snap[snap["status"].isin(["Approved", "Declined"])]
+    if decided.empty:
+        return pd.DataFrame(columns=["Week", "Approval Rate", "Decided"])
+    approved = (decided["status"] == "Approved").to_numpy(dtype=np.int64)
+    grouped = pd.DataFrame({"Week": _week(decided["submitted"]).to_numpy(), "approved": approved})
+    weekly = grouped.groupby("Week")["approved"].agg(["sum", "count"])
+    return pd.DataFrame({
+        "Week": weekly.index,
+        "Approval Rate": (weekly["sum"] / weekly["count"] * 100).round(1).to_numpy(),
+        "Decided": weekly["count"].to_numpy(),
+    })
+
+
+def lead_times(snap):
+    # Days between submission and start, only for rows with a recorded submission time.
+    known = snap[snap["created"].notna()]
+    days = (known["start"] - known["created"]).dt.total_seconds().to_numpy() / 86400
+    return pd.DataFrame({"Lead Days": np.round(days, 1), "Status": known["status"].to_numpy()})
+
+
+def busiest_locations(snap, top=10):
+    booked = snap[snap["status"] != "Declined"]
+    if booked.empty:
+        return pd.DataFrame(columns=["Location", "Events", "Booked Hours"])
+    hours = np.clip((booked["end"] - booked["start"]).dt.total_seconds().to_numpy() / 3600, 0, None)
+    frame = pd.DataFrame({"Location": booked["location"].to_numpy(), "hours": hours})
+    per_loc = frame.groupby("Location", observed=True)["hours"].agg(["size", "sum"])
+    per_loc = per_loc.sort_values(["size", "sum"], ascending=False).head(top)
+    return pd.DataFrame({
+        "Location": per_loc.index.astype(str),
+        "Events": per_loc["size"].to_numpy(),
+        "Booked Hours": per_loc["sum"].round(1).to_numpy(),
+    })
+
+
+def compute_analytics():
+    def build():
+        snap = load_snapshot()
+        return {
+            "weekly": requests_per_week(snap),
+            "approval": approval_rate(snap),
+            "lead": lead_times(snap),
+            "locations": busiest_locations(snap),
+        }
+
+    return _analytics_cache.get_or_compute("analytics", build)
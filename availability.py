@@ -0,0 +1,60 @@
+import bisect
+import datetime
+
+from utils import booking_index
+from occupancy import OPEN_HOURS
+
+SLOT = datetime.timedelta(minutes=15)
+
+
+def align_to_slot(dt):
+    # Round up to the next 15-minute boundary used by get_time_slots().
+    base = dt.replace(minute=0, second=0, microsecond=0)
+    steps = -(-(dt - base) // SLOT)
+    return base + steps * SLOT
+
+
+def _opening(cursor, duration, open_hours):
+    cursor = align_to_slot(cursor)
+    if not open_hours:
+        return cursor
+    day_open = datetime.datetime.combine(cursor.date(), datetime.time(open_hours[0]))
+    day_close = datetime.datetime.combine(cursor.date(), datetime.time(open_hours[1]))
+    if cursor < day_open:
+        return day_open
+    if cursor + duration > day_close:
+        return day_open + datetime.timedelta(days=1)
+    return cursor
+
+
+def free_windows(bookings, duration, earliest, latest, count=3, open_hours=OPEN_HOURS):
+    # bookings: (start, end, ...) sorted by start. Walks the list once, keeping the latest
+    # end among bookings that start before the candidate window closes; a candidate is free
+    # when that end is not after its start, otherwise the scan jumps to the end of the blocker.
+    duration = max(duration, SLOT)
+    if open_hours and duration > datetime.timedelta(hours=open_hours[1] - open_hours[0]):
+        open_hours = None
+    starts = [b[0] for b in bookings]
+    longest = max((b[1] - b[0] for b in bookings), default=datetime.timedelta(0))
+    i = bisect.bisect_left(starts, earliest - longest)
+    blocked_until = None
+
+    windows = []
+    cursor = _opening(earliest, duration, open_hours)
+    while len(windows) < count and cursor + duration <= latest:
+        while i < len(bookings) and bookings[i][0] < cursor + duration:
+            if blocked_until is None or bookings[i][1] > blocked_until:
+                blocked_until = bookings[i][1]
+            i += 1
+        if blocked_until is not None and blocked_until > cursor:
+            cursor = _opening(blocked_until, duration, open_hours)
+            continue
+        windows.append((cursor, cursor + duration))
+        cursor = _opening(cursor + duration, duration, open_hours)
+    return windows
+
+
+def find_free_windows(location_id, duration, earliest=None, horizon_days=14, count=3, open_hours=OPEN_HOURS):
+    earliest = max(earliest or datetime.datetime.now(), datetime.datetime.now())
+    latest = earliest + datetime.timedelta(days=horizon_days)
+    return free_windows(booking_index.bookings(location_id), duration, earliest, latest, count, open_hours)
@@ -0,0 +1,94 @@
+import argparse
+import datetime
+import itertools
+import os
+import random
+
+from db import SQLiteBackend
+
+LOCATION_KINDS = [
+    ("Auditorium", "Indoor", (300, 1200)), ("Hall", "Indoor", (100, 400)), ("Conference Room", "Indoor", (20, 80)),
+    ("Classroom", "Indoor", (30, 60)), ("Gym", "Indoor", (200, 800)), ("Field", "Outdoor", (500, 3000)),
+    ("Plaza", "Outdoor", (100, 600)),
+]
+# (weight, minimum, maximum) in hours; most events are a few hours, a few run for days.
+DURATIONS = [(55, 1, 4), (25, 4, 10), (12, 24, 48), (6, 48, 120), (2, 168, 336)]
+STATUSES = (["Approved"] * 60) + (["Pending"] * 25) + (["Declined"] * 15)
+BATCH = 10_000
+ORIGIN = datetime.datetime(2025, 8, 1)
+
+
+def _locations(count, rng):
+    rows = []
+    for i in range(count):
+        kind, loc_type, (low, high) = LOCATION_KINDS[i % len(LOCATION_KINDS)]
+        capacity = rng.randrange(low, high + 1, 10)
+        rows.append((f"{kind} {i // len(LOCATION_KINDS) + 1}", f"Building {chr(65 + i % 12)}", f"{capacity:,} pax",
+                     "Unavailable" if rng.random() < 0.05 else "Available", loc_type, "Facilities Office", "555-0100"))
+    return rows
+
+
+def _events(count, location_ids, rng, origin, span_days, blob_share, blob_kb):
+    weights = [d[0] for d in DURATIONS]
+    # A few popular venues take most bookings, which produces realistic clusters of overlaps.
+    venue_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(location_ids))))
+    display = rng.randbytes(blob_kb * 1024) if blob_share else None
+    thumb = display[:max(len(display) // 10, 1)] if display else None
+    for i in range(count):
+        start = origin + datetime.timedelta(days=rng.randrange(span_days), minutes=15 * rng.randrange(28, 80))
+        _, low, high = rng.choices(DURATIONS, weights)[0]
+        end = start + datetime.timedelta(minutes=15 * rng.randrange(low * 4, high * 4 + 1))
+        created = start - datetime.timedelta(days=rng.randrange(0, 60), hours=rng.randrange(24))
+        has_blob = display is not None and rng.random() < blob_share
+        yield (rng.choices(location_ids, cum_weights=venue_weights)[0], f"Event {i}", start, end, f"Org {rng.randrange(500)}",
+               "Synthetic benchmark event", "Public" if rng.random() < 0.7 else "Private", rng.choice(STATUSES),
+               display if has_blob else None, thumb if has_blob else None, created)
+
+
+def generate(path, events=10_000, locations=40, seed=0, blob_share=0.0, blob_kb=150, span_days=1095, origin=ORIGIN,
+             log=print):
+    # Builds a fresh SQLite stand-in at `path` from the schema file and fills it deterministically for `seed`.
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    rng = random.Random(seed)
+    conn = SQLiteBackend(path).connect()
+    try:
+        conn.executemany("""INSERT INTO Location (loc_name, loc_address, loc_capacity, loc_status, loc_type,
+                            loc_contact_person, loc_phone) VALUES (?,?,?,?,?,?,?)""", _locations(locations, rng))
+        location_ids = [row[0] for row in conn.execute("SELECT location_id FROM Location ORDER BY location_id")]
+
+        sql = """INSERT INTO Event (location_id, evn_name, evn_start_date, evn_end_date, evn_organizer,
+                 evn_description, evn_type, evn_status, evn_image, evn_thumb, evn_created_at)
+                 VALUES (?,?,?,?,?,?,?,?,?,?,?)"""
+        batch = []
+        for row in _events(events, location_ids, rng, origin, span_days, blob_share, blob_kb):
+            batch.append(row)
+            if len(batch) == BATCH:
+                conn.executemany(sql, batch)
+                batch.clear()
+        if batch:
+            conn.executemany(sql, batch)
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    log(f"{path}: {locations} locations, {events:,} events (seed {seed}, blobs {blob_share:.0%})")
+    return {"path": path, "events": events, "locations": locations, "seed": seed,
+            "blob_share": blob_share, "blob_kb": blob_kb, "span_days": span_days, "origin": origin.date().isoformat()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic campus-scale SQLite database")
+    parser.add_argument("--path", default="benchmark.sqlite3")
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--locations", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--blobs", type=float, default=0.0, help="Share of events with a poster blob (0-1)")
+    parser.add_argument("--blob-kb", type=int, default=150)
+    args = parser.parse_args()
+    generate(args.path, args.events, args.locations, args.seed, args.blobs, args.blob_kb)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import datetime
+import random
+import time
+
+from calendar_layout import layout_spans, spans_to_day_slots
+from event_model import EventTable, make_event
+
+
+def legacy_day_slots(events_raw):
+    # The slot-packing loop fetch_and_process_events_for_calendar used before calendar_layout.
+    day_slots = {}
+    events_raw.sort(key=lambda x: (x['start'], -x['duration']))
+    for evt in events_raw:
+        start_d = evt['start']
+        duration = evt['duration']
+        slot_index = 0
+        while True:
+            is_slot_free = True
+            for i in range(duration):
+                check_date = start_d + datetime.timedelta(days=i)
+                if check_date not in day_slots:
+                    day_slots[check_date] = {}
+                if slot_index in day_slots[check_date]:
+                    is_slot_free = False
+                    break
+            if is_slot_free:
+                break
+            else:
+                slot_index += 1
+        for i in range(duration):
+            current_d = start_d + datetime.timedelta(days=i)
+            day_slots[current_d][slot_index] = evt['name']
+    return day_slots
+
+
+def synthetic_events(count, seed=0, span_days=1460):
+    rng = random.Random(seed)
+    origin = datetime.datetime(2024, 1, 1, 8)
+    events = []
+    for i in range(count):
+        start = origin + datetime.timedelta(days=rng.randrange(span_days))
+        duration = 1 if rng.random() < 0.6 else rng.choice([2, 3, 4, 5, 7, 14, 30])
+        end = start + datetime.timedelta(days=duration - 1, hours=4)
+        events.append(make_event(f"evt-{i}", start, end, f"Room {i % 12}", "", "#555"))
+    return events
+
+
+def as_dicts(events):
+    return [{"name": e.name, "start": e.start, "duration": e.duration} for e in events]
+
+
+def lanes_by_event(day_slots):
+    lanes = {}
+    for slots in day_slots.values():
+        for lane, name in slots.items():
+            lanes[name] = lane
+    return lanes
+
+
+def run(sizes, seed=0):
+    results = []
+    for size in sizes:
+        events = synthetic_events(size, seed)
+
+        started = time.perf_counter()
+        legacy = legacy_day_slots(as_dicts(events))
+        legacy_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        table, lanes = layout_spans(EventTable(events))
+        engine_s = time.perf_counter() - started
+
+        window_start = datetime.date(2025, 3, 31)
+        started = time.perf_counter()
+        spans_to_day_slots(table, lanes, window_start, window_start + datetime.timedelta(days=42))
+        month_s = time.perf_counter() - started
+
+        same = lanes_by_event(legacy) == {evt.name: lane for evt, lane in zip(table, lanes.tolist())}
+        results.append({"events": size, "legacy_s": legacy_s, "engine_s": engine_s,
+                        "month_expand_s": month_s, "speedup": legacy_s / engine_s, "identical": same})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calendar lane assignment: legacy loop vs interval partitioning")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 30_000, 100_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(f"{'events':>8} {'legacy s':>10} {'engine s':>10} {'month s':>9} {'speedup':>8}  identical")
+    for r in run(args.sizes, args.seed):
+        print(f"{r['events']:>8} {r['legacy_s']:>10.3f} {r['engine_s']:>10.3f} {r['month_expand_s']:>9.4f} "
+              f"{r['speedup']:>7.1f}x  {r['identical']}")
+
+
+if __name__ == "__main__":
+    main()
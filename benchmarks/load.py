@@ -0,0 +1,274 @@
+import argparse
+import datetime
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from streamlit import config
+from streamlit.logger import set_log_level
+from streamlit.runtime import Runtime
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.generate import generate
+from benchmarks.suite import git_revision
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SESSION_KEY = "_load_session"
+
+
+class CallCounter:
+    # Counts database calls per simulated session by wrapping QueryStats.record; the
+    # session is identified through a marker each harness session puts in session state.
+    # Queries on utils.submit_queries workers are attributed through the forwarded script context.
+
+    def __init__(self, query_stats, script_ctx):
+        self.counts = defaultdict(int)
+        self._lock = threading.Lock()
+        self._script_ctx = script_ctx
+        self._record = query_stats.record
+        query_stats.record = self._counting_record
+
+    def _counting_record(self, *args, **kwargs):
+        ctx = self._script_ctx()
+        if ctx is not None:
+            session = ctx.session_state.filtered_state.get(SESSION_KEY)
+            with self._lock:
+                self.counts[session] += 1
+        return self._record(*args, **kwargs)
+
+    def __getitem__(self, session):
+        with self._lock:
+            return self.counts[session]
+
+
+class PeakRSS:
+    def __init__(self, interval=0.1):
+        self.peak = 0
+        self._stop = threading.Event()
+        try:
+            import psutil
+            self._process = psutil.Process()
+        except ImportError:
+            self._process = None
+        self._thread = threading.Thread(target=self._sample, args=(interval,), daemon=True)
+
+    def _sample(self, interval):
+        while not self._stop.wait(interval):
+            self.peak = max(self.peak, self._process.memory_info().rss)
+
+    def __enter__(self):
+        if self._process is not None:
+            self.peak = self._process.memory_info().rss
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._process is not None:
+            self._stop.set()
+            self._thread.join()
+        else:
+            import resource
+            self.peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def share_runtime():
+    # AppTest installs a mock Runtime singleton for each run and clears it when the run ends,
+    # which would pull it out from under every other session still running. The harness keeps
+    # the latest one available instead, the way a real server has one Runtime for all sessions.
+    # Pages get their backend from utils.set_backend() rather than per-run st.secrets, which
+    # AppTest also swaps globally.
+    original = Runtime.instance.__func__
+    latest = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            latest["runtime"] = cls._instance
+            return cls._instance
+        return latest["runtime"] if latest else original(cls)
+
+    Runtime.instance = classmethod(instance)
+    config.set_option("global.appTest", True)
+
+
+class Session:
+    def __init__(self, number, counter, samples, seed):
+        self.number = number
+        self.counter = counter
+        self.samples = samples
+        self.rng = random.Random(seed * 100_003 + number)
+        self.journey = None
+        self.step = None
+
+    def open(self, page, **state):
+        at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=60)
+        at.session_state[SESSION_KEY] = self.number
+        for key, value in state.items():
+            at.session_state[key] = value
+        return at
+
+    def run(self, step, at):
+        self.step = step
+        calls = self.counter[self.number]
+        started = time.perf_counter()
+        at.run()
+        elapsed = (time.perf_counter() - started) * 1000
+        self.samples.append({"journey": self.journey, "step": step, "ms": elapsed,
+                             "db_calls": self.counter[self.number] - calls, "errors": len(at.exception)})
+        return at
+
+
+def _button(at, label):
+    return next(b for b in at.button if b.label.startswith(label))
+
+
+def browse_calendar(s):
+    s.run("landing", s.open("main.py"))
+    at = s.run("calendar", s.open("view_calendar.py"))
+    for _ in range(s.rng.randrange(1, 4)):
+        _button(at, "Next").click()
+        s.run("calendar_next", at)
+
+
+def _widget(elements, label):
+    return next(w for w in elements if w.label == label)
+
+
+def request_event(s):
+    at = s.run("request_form", s.open("add_event.py"))
+    day = datetime.date.today() + datetime.timedelta(days=s.rng.randrange(1, 120))
+    location = _widget(at.selectbox, "Location")
+    slots = _widget(at.selectbox, "Start Time").options
+    start = s.rng.randrange(28, 80)
+    _widget(at.text_input, "Event Title").input(f"Load test event {s.number}-{s.rng.randrange(10**6)}")
+    _widget(at.text_input, "Organizer Name").input("Load Harness")
+    location.select_index(s.rng.randrange(len(location.options)))
+    _widget(at.date_input, "Start Date").set_value(day)
+    _widget(at.date_input, "End Date").set_value(day)
+    _widget(at.selectbox, "Start Time").set_value(slots[start])
+    _widget(at.selectbox, "End Time").set_value(slots[min(start + s.rng.randrange(4, 16), len(slots) - 1)])
+    _button(at, "🚀 Submit").click()
+    s.run("request_submit", at)
+
+
+def check_status(s):
+    at = s.run("status_form", s.open("check_status.py"))
+    _widget(at.text_input, "Tracking ID").input(str(s.rng.randrange(1, 1000)))
+    _button(at, "Track").click()
+    s.run("status_lookup", at)
+
+
+def admin_review(s):
+    at = s.run("login_page", s.open("main.py"))
+    _widget(at.text_input, "Username").input("admin")
+    _widget(at.text_input, "Password").input("password123")
+    _button(at, "🔐 Login").click()
+    s.run("login_submit", at)
+    at = s.run("event_manage", s.open("event_manage.py", role="admin"))
+    at.radio[0].set_value("Pending")
+    s.run("event_manage_pending", at)
+    s.run("summary", s.open("summary.py", role="admin"))
+
+
+JOURNEYS = {"browse_calendar": (browse_calendar, 50), "check_status": (check_status, 20),
+            "request_event": (request_event, 20), "admin_review": (admin_review, 10)}
+
+
+def _session_worker(session, iterations, journeys):
+    names = list(journeys)
+    weights = [JOURNEYS[name][1] for name in names]
+    for _ in range(iterations):
+        session.journey = session.rng.choices(names, weights)[0]
+        try:
+            JOURNEYS[session.journey][0](session)
+        except Exception as e:
+            session.samples.append({"journey": session.journey, "step": "harness_error", "ms": 0.0,
+                                    "db_calls": 0, "errors": 1, "message": f"{session.step}: {e!r}"})
+
+
+def _stats(samples):
+    ms = np.array([s["ms"] for s in samples])
+    calls = np.array([s["db_calls"] for s in samples])
+    return {"reruns": len(samples), "p50_ms": round(float(np.percentile(ms, 50)), 2),
+            "p95_ms": round(float(np.percentile(ms, 95)), 2), "p99_ms": round(float(np.percentile(ms, 99)), 2),
+            "max_ms": round(float(ms.max()), 2), "db_calls_per_rerun": round(float(calls.mean()), 2),
+            "errors": int(sum(s["errors"] for s in samples))}
+
+
+def run_load(db_path, sessions=20, concurrency=8, iterations=5, journeys=None, seed=0):
+    import utils
+    from db import SQLiteBackend
+    utils.set_backend(SQLiteBackend(db_path))
+    share_runtime()
+    counter = CallCounter(utils.query_stats, utils.caller_script_run_ctx)
+    journeys = journeys or list(JOURNEYS)
+    samples = []
+
+    with PeakRSS() as rss:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for number in range(sessions):
+                session = Session(number + 1, counter, samples, seed)
+                pool.submit(_session_worker, session, iterations, journeys)
+        wall = time.perf_counter() - started
+
+    timed = [s for s in samples if s["step"] != "harness_error"]
+    by_step = defaultdict(list)
+    for sample in timed:
+        by_step[f"{sample['journey']}.{sample['step']}"].append(sample)
+    return {
+        **git_revision(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "sessions": sessions, "concurrency": concurrency, "iterations": iterations, "seed": seed,
+        "wall_s": round(wall, 2), "reruns_per_s": round(len(timed) / wall, 2) if wall else 0,
+        "peak_rss_mb": round(rss.peak / 1024 / 1024, 1),
+        "overall": _stats(timed) if timed else {},
+        "steps": {step: _stats(items) for step, items in sorted(by_step.items())},
+        "harness_errors": [s["message"] for s in samples if s["step"] == "harness_error"][:20],
+    }
+
+
+def print_report(report):
+    print(f"{report['sessions']} sessions x {report['iterations']} journeys, concurrency {report['concurrency']}: "
+          f"{report['overall'].get('reruns', 0)} reruns in {report['wall_s']} s "
+          f"({report['reruns_per_s']}/s), peak RSS {report['peak_rss_mb']} MB")
+    print(f"{'step':<38} {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'db/run':>7} {'err':>4}")
+    for step, s in [("overall", report["overall"]), *report["steps"].items()]:
+        if s:
+            print(f"{step:<38} {s['reruns']:>5} {s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f} "
+                  f"{s['max_ms']:>8.1f} {s['db_calls_per_rerun']:>7.1f} {s['errors']:>4}")
+    for message in report["harness_errors"]:
+        print(f"  harness error: {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the portal pages with concurrent simulated sessions")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=5, help="Journeys per session")
+    parser.add_argument("--journeys", nargs="+", choices=list(JOURNEYS))
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", default=None, help="Database path (default: loadtest-<events>.sqlite3)")
+    parser.add_argument("--reuse", action="store_true", help="Reuse an existing database at --db")
+    parser.add_argument("--output", default=None, help="Also write the report as JSON")
+    args = parser.parse_args()
+    config.set_option("logger.level", "error")
+    set_log_level("error")
+
+    db_path = os.path.abspath(args.db or f"loadtest-{args.events}.sqlite3")
+    if not (args.reuse and os.path.exists(db_path)):
+        generate(db_path, args.events, seed=args.seed)
+    report = run_load(db_path, args.sessions, args.concurrency, args.iterations, args.journeys, args.seed)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
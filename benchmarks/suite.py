@@ -0,0 +1,280 @@
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import time
+
+from benchmarks.generate import generate, ORIGIN
+
+# The aggregate summary.py ran on every rerun before the status counters existed.
+LEGACY_SUMMARY_SQL = """
+    SELECT
+        COUNT(*) as Total_Event,
+        SUM(CASE WHEN evn_start_date BETWEEN GETDATE() AND DATEADD(day, 7, GETDATE()) THEN 1 ELSE 0 END) as Soon_Event,
+        SUM(CASE WHEN evn_status = 'Pending' THEN 1 ELSE 0 END) as Preparing,
+        SUM(CASE WHEN evn_status = 'Approved' THEN 1 ELSE 0 END) as Completed,
+        SUM(CASE WHEN evn_status = 'Declined' THEN 1 ELSE 0 END) as Canceled
+    FROM Event;
+"""
+RECENT_LOG_SQL = """
+    SELECT TOP 20 evn_name, FORMAT(evn_start_date, 'yyyy-MM-dd') as Start_Date,
+           FORMAT(evn_end_date, 'yyyy-MM-dd') as End_Date, evn_status
+    FROM Event ORDER BY evn_start_date DESC;
+"""
+# A month well inside the generated range, so every case sees a populated calendar.
+MONTH = (ORIGIN.year + 1, 10)
+
+
+def measure(fn, repeat, setup=None):
+    # With a setup (e.g. a cache invalidation) every run is cold; without one, an untimed
+    # first call warms caches and indexes so the samples show the steady state.
+    if setup is None:
+        fn()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": round(statistics.median(samples), 4), "min_ms": round(min(samples), 4),
+            "max_ms": round(max(samples), 4), "runs": repeat}
+
+
+def _cold():
+    from cache import bump_data_version
+    bump_data_version("Event")
+
+
+def case_calendar_fetch(repeat):
+    from utils import fetch_and_process_events_for_calendar, calendar_window
+    window = calendar_window(*MONTH)
+    return {
+        "cold": measure(lambda: fetch_and_process_events_for_calendar(*window), repeat, _cold),
+        "warm": measure(lambda: fetch_and_process_events_for_calendar(*window), repeat),
+    }
+
+
+def case_calendar_html(repeat):
+    from utils import fetch_and_process_events_for_calendar, calendar_window
+    from calendar_render import build_month_html, render_month
+    day_slots, _, _ = fetch_and_process_events_for_calendar(*calendar_window(*MONTH))
+    return {
+        "build_full": measure(lambda: build_month_html(*MONTH, "full", day_slots), repeat),
+        "build_compact": measure(lambda: build_month_html(*MONTH, "compact", day_slots), repeat),
+        "render_cold": measure(lambda: render_month(*MONTH, "full"), repeat, _cold),
+        "render_warm": measure(lambda: render_month(*MONTH, "full"), repeat),
+    }
+
+
+def case_check_conflict(repeat, checks=1000, seed=0):
+    from utils import check_conflict, run_query
+    rng = random.Random(seed)
+    locations = [row[0] for row in run_query("SELECT location_id FROM Location")]
+    probes = []
+    for _ in range(checks):
+        start = ORIGIN + datetime.timedelta(days=rng.randrange(1095), minutes=15 * rng.randrange(28, 80))
+        probes.append((rng.choice(locations), start, start + datetime.timedelta(hours=rng.randrange(1, 6))))
+
+    def run_checks():
+        for probe in probes:
+            check_conflict(*probe)
+
+    warm = measure(run_checks, repeat)
+    return {
+        "index_build": measure(lambda: check_conflict(*probes[0]), repeat, _cold),
+        f"{checks}_checks": warm,
+        "per_check_us": round(warm["median_ms"] * 1000 / checks, 3),
+    }
+
+
+def case_summary(repeat):
+    from utils import run_query, submit_queries, status_counters
+    from analytics import compute_analytics
+
+    def page_cold():
+        _cold()
+        status_counters.invalidate()
+
+    def page_serial():
+        return status_counters.snapshot(), compute_analytics(), run_query(RECENT_LOG_SQL)
+
+    def page_parallel():
+        # As summary.py: the reads on the executor, the analytics on this thread meanwhile.
+        results = submit_queries({"counts": status_counters.snapshot, "recent": RECENT_LOG_SQL})
+        trends = compute_analytics()
+        return results["counts"].result(), trends, results["recent"].result()
+
+    return {
+        "page_serial_cold": measure(page_serial, repeat, page_cold),
+        "page_parallel_cold": measure(page_parallel, repeat, page_cold),
+        "legacy_aggregate_sql": measure(lambda: run_query(LEGACY_SUMMARY_SQL), repeat),
+        "status_counters": measure(status_counters.snapshot, repeat),
+        "recent_log": measure(lambda: run_query(RECENT_LOG_SQL), repeat),
+        "analytics_cold": measure(compute_analytics, repeat, _cold),
+        "analytics_warm": measure(compute_analytics, repeat),
+    }
+
+
+def case_event_manage(repeat, page_size=50):
+    from event_queries import count_events, fetch_event_page, fetch_event_metrics
+
+    def listing(status="All", search="", last=False):
+        total = count_events(status, search)
+        page = max(1, -(-total // page_size)) if last else 1
+        return fetch_event_page(status, search, page, page_size)
+
+    return {
+        "metrics": measure(fetch_event_metrics, repeat),
+        "first_page": measure(listing, repeat),
+        "last_page": measure(lambda: listing(last=True), repeat),
+        "pending_first_page": measure(lambda: listing("Pending"), repeat),
+        "search_first_page": measure(lambda: listing("All", "Event 12"), repeat),
+    }
+
+
+def case_export(repeat):
+    # Runs the exports the way the deferred download buttons do, through Streamlit's own converter,
+    # so a return type st.download_button can't serve fails here rather than on click.
+    from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+    from event_export import export_csv, export_xlsx
+
+    def download(export):
+        data, _ = convert_data_to_bytes_and_infer_mime(
+            export(), unsupported_error=TypeError(f"{export.__name__} returned unsupported download data")
+        )
+        return data
+
+    return {
+        "xlsx": measure(lambda: download(export_xlsx), repeat),
+        "csv": measure(lambda: download(export_csv), repeat),
+    }
+
+
+CASES = {
+    "calendar_fetch": case_calendar_fetch,
+    "calendar_html": case_calendar_html,
+    "check_conflict": case_check_conflict,
+    "summary": case_summary,
+    "event_manage": case_event_manage,
+    "export": case_export,
+}
+
+
+def git_revision():
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def run(db_path, dataset, cases=None, repeat=5, log=print):
+    import utils
+    from db import SQLiteBackend
+    utils.set_backend(SQLiteBackend(db_path))
+
+    results = {}
+    for name in cases or CASES:
+        log(f"  {name}...")
+        results[name] = CASES[name](repeat)
+    return {
+        **git_revision(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(), "platform": platform.platform(), "sqlite": sqlite3.sqlite_version,
+        "dataset": dataset, "repeat": repeat, "results": results,
+    }
+
+
+def _flatten(report):
+    for case, metrics in report["results"].items():
+        for metric, value in metrics.items():
+            yield f"{case}.{metric}", value["median_ms"] if isinstance(value, dict) else value
+
+
+def compare(baseline, current):
+    old = dict(_flatten(baseline))
+    rows = []
+    for key, new in _flatten(current):
+        before = old.get(key)
+        change = (new - before) / before * 100 if before else None
+        rows.append((key, before, new, change))
+    return rows
+
+
+def print_report(report):
+    print(f"commit {str(report['commit'])[:10]}{' (dirty)' if report['dirty'] else ''}, "
+          f"{report['dataset']['events']:,} events")
+    for key, value in _flatten(report):
+        print(f"  {key:<40} {value:>12.3f}")
+
+
+def print_comparison(rows, baseline, current):
+    print(f"{'metric':<40} {str(baseline['commit'])[:10]:>12} {str(current['commit'])[:10]:>12} {'change':>9}")
+    for key, before, new, change in rows:
+        before_s = f"{before:>12.3f}" if before is not None else f"{'-':>12}"
+        change_s = f"{change:>+8.1f}%" if change is not None else f"{'':>9}"
+        print(f"{key:<40} {before_s} {new:>12.3f} {change_s}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the calendar, conflict, summary and listing paths")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmd = sub.add_parser("run", help="Generate (or reuse) a database and run the benchmark cases")
+    cmd.add_argument("--events", type=int, default=10_000)
+    cmd.add_argument("--locations", type=int, default=40)
+    cmd.add_argument("--seed", type=int, default=0)
+    cmd.add_argument("--blobs", type=float, default=0.0, help="Share of events with a poster blob (0-1)")
+    cmd.add_argument("--db", default=None, help="Database path (default: benchmark-<events>.sqlite3)")
+    cmd.add_argument("--reuse", action="store_true", help="Reuse an existing database at --db")
+    cmd.add_argument("--repeat", type=int, default=5)
+    cmd.add_argument("--cases", nargs="+", choices=list(CASES))
+    cmd.add_argument("--output", default=None, help="JSON file (default: benchmarks/results/<time>-<commit>.json)")
+    cmd.add_argument("--compare", default=None, help="Baseline JSON to compare against")
+    cmp = sub.add_parser("compare", help="Compare two saved result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    args = parser.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        print_comparison(compare(baseline, current), baseline, current)
+        return
+
+    db_path = args.db or f"benchmark-{args.events}.sqlite3"
+    if args.reuse and os.path.exists(db_path):
+        dataset = {"path": db_path, "events": args.events, "locations": args.locations, "seed": args.seed,
+                   "blob_share": args.blobs, "reused": True}
+    else:
+        dataset = generate(db_path, args.events, args.locations, args.seed, args.blobs)
+    report = run(db_path, dataset, args.cases, args.repeat)
+
+    output = args.output
+    if output is None:
+        os.makedirs(os.path.join("benchmarks", "results"), exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join("benchmarks", "results", f"{stamp}-{str(report['commit'])[:10]}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"saved {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print_comparison(compare(baseline, report), baseline, report)
+
+
+if __name__ == "__main__":
+    main()
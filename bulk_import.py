@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+from utils import execute_many, booking_index
+from location_catalog import location_catalog
+
+COLUMN_ALIASES = {
+    "name": "name", "event name": "name", "title": "name", "event title": "name", "evn_name": "name",
+    "location": "location", "venue": "location", "loc_name": "location",
+    "start": "start", "start date": "start", "evn_start_date": "start",
+    "end": "end", "end date": "end", "evn_end_date": "end",
+    "organizer": "organizer", "organiser": "organizer", "evn_organizer": "organizer",
+    "description": "description", "purpose": "description", "evn_description": "description",
+    "type": "type", "event type": "type", "evn_type": "type",
+}
+REQUIRED = ["name", "location", "start", "end"]
+EVENT_TYPES = ["Public", "Private"]
+
+INSERT_SQL = """
+    INSERT INTO Event
+    (location_id, evn_name, evn_start_date, evn_end_date,
+     evn_organizer, evn_description, evn_type, evn_status, evn_created_at)
+    VALUES (?,?,?,?,?,?,?,?,GETDATE())
+"""
+
+
+def read_spreadsheet(file, filename):
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        return pd.read_excel(file, engine="openpyxl", dtype=object)
+    return pd.read_csv(file, dtype=object, skipinitialspace=True)
+
+
+def validate(raw):
+    # Returns (rows, errors): rows is a DataFrame of importable events, errors a list of (row, message).
+    df = raw.rename(columns=lambda c: COLUMN_ALIASES.get(str(c).strip().lower(), str(c).strip().lower()))
+    missing = [c for c in REQUIRED if c not in df.columns]
+    if missing:
+        return pd.DataFrame(), [(None, f"Missing column(s): {', '.join(missing)}")]
+    for col in ["organizer", "description", "type"]:
+        if col not in df.columns:
+            df[col] = None
+
+    df = df.assign(row=np.arange(2, len(df) + 2))
+    df["name"] = df["name"].astype("string").str.strip()
+    df["type"] = df["type"].astype("string").str.strip().str.title().fillna("Public")
+    df["start"] = pd.to_datetime(df["start"], errors="coerce", format="mixed")
+    df["end"] = pd.to_datetime(df["end"], errors="coerce", format="mixed")
+
+    # Only bookable venues, as on the request form; known but unavailable ones get their own message.
+    catalog = location_catalog()
+    locations = {str(name).strip().lower(): loc_id for name, loc_id in catalog.available.items()}
+    known = {str(name).strip().lower() for name in catalog.ids}
+    location_key = df["location"].astype("string").str.strip().str.lower()
+    df["location_id"] = location_key.map(locations)
+
+    checks = [
+        (df["name"].isna() | (df["name"] == ""), "Event name is empty"),
+        (df["location_id"].isna() & location_key.isin(known), "Location is unavailable"),
+        (df["location_id"].isna(), "Unknown location"),
+        (df["start"].isna(), "Start is not a valid date/time"),
+        (df["end"].isna(), "End is not a valid date/time"),
+        (df["end"] < df["start"], "End is before start"),
+        (~df["type"].isin(EVENT_TYPES), "Type must be Public or Private"),
+    ]
+    errors = []
+    bad = np.zeros(len(df), dtype=bool)
+    for mask, message in checks:
+        mask = mask.fillna(False).to_numpy(dtype=bool)
+        errors.extend((int(r), message) for r in df["row"].to_numpy()[mask & ~bad])
+        bad |= mask
+    rows = df.loc[~bad, ["row", "name", "location", "location_id", "start", "end", "organizer", "description", "type"]]
+    rows = rows.astype({"location_id": "int64"}).reset_index(drop=True)
+    return rows, sorted(errors)
+
+
+def _expand(lo, hi):
+    # Every (i, j) with lo[i] <= j < hi[i], without a Python loop.
+    counts = np.maximum(hi - lo, 0)
+    i = np.repeat(np.arange(len(lo)), counts)
+    j = np.repeat(lo, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return i, j
+
+
+def _file_overlaps(starts, ends):
+    # Every overlapping pair among one location's file rows. With rows in start order, the rows that
+    # can overlap row i from later in the order are exactly the run that starts before row i ends.
+    order = np.lexsort((ends, starts))
+    s, e = starts[order], ends[order]
+    i, j = _expand(np.arange(1, len(s) + 1), np.searchsorted(s, e, side="left"))
+    keep = e[j] > s[i]
+    return order[i[keep]], order[j[keep]]
+
+
+def _booking_overlaps(starts, ends, bookings):
+    # Every (file row, existing booking) overlap at one location. Bookings come sorted by start, so those
+    # that can overlap a row start no earlier than its start minus the longest booking and before its end.
+    if not bookings:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    b_starts = np.array([b[0] for b in bookings], dtype="datetime64[ns]")
+    b_ends = np.array([b[1] for b in bookings], dtype="datetime64[ns]")
+    longest = (b_ends - b_starts).max()
+    i, j = _expand(np.searchsorted(b_starts, starts - longest, side="left"), np.searchsorted(b_starts, ends, side="left"))
+    keep = b_ends[j] > starts[i]
+    return i[keep], j[keep]
+
+
+def find_conflicts(rows):
+    # Returns one entry per clashing pair: (file row, other file row or None, existing event id or None, location).
+    clashes = []
+    for location_id, group in rows.groupby("location_id", sort=False):
+        file_rows = group["row"].to_numpy()
+        location = group["location"].iloc[0]
+        starts, ends = group["start"].to_numpy("datetime64[ns]"), group["end"].to_numpy("datetime64[ns]")
+        first, second = _file_overlaps(starts, ends)
+        for a, b in zip(first, second):
+            a_row, b_row = sorted((int(file_rows[a]), int(file_rows[b])))
+            clashes.append((a_row, b_row, None, location))
+        bookings = booking_index.bookings(int(location_id))
+        for i, j in zip(*_booking_overlaps(starts, ends, bookings)):
+            clashes.append((int(file_rows[i]), None, bookings[j][2], location))
+    return sorted(clashes, key=lambda c: (c[0], c[1] or 0, c[2] or 0))
+
+
+def clean_rows(rows, clashes):
+    blocked = {c[0] for c in clashes} | {c[1] for c in clashes if c[1] is not None}
+    return rows[~rows["row"].isin(blocked)]
+
+
+def import_rows(rows, status="Pending"):
+    params = [
+        (int(r.location_id), r.name, r.start.to_pydatetime(), r.end.to_pydatetime(),
+         None if pd.isna(r.organizer) else str(r.organizer), None if pd.isna(r.description) else str(r.description),
+         r.type, status)
+        for r in rows.itertuples(index=False)
+    ]
+    bookings = [(p[0], p[2], p[3]) for p in params] if status != "Declined" else None
+    return execute_many(INSERT_SQL, params, bookings)
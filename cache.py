@@ -0,0 +1,167 @@
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+_versions = {}
+_versions_lock = threading.Lock()
+_named_caches = {}
+_shared_store = None
+
+_WRITE_TABLE = re.compile(
+    r"^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|DELETE)\s+(?:\[?dbo\]?\.)?\[?(\w+)\]?",
+    re.IGNORECASE
+)
+
+
+def written_table(sql):
+    m = _WRITE_TABLE.match(sql)
+    return m.group(1).lower() if m else None
+
+
+def use_shared_store(store):
+    # With a SharedCache, data versions come from (and are bumped in) the shared store, so writes in
+    # one process invalidate every process's caches, and shared VersionedCaches fill misses from it.
+    global _shared_store
+    _shared_store = store
+
+
+def data_version(*tables):
+    if _shared_store is not None:
+        return _shared_store.versions(*tables)
+    with _versions_lock:
+        return tuple(_versions.get(t.lower(), 0) for t in tables)
+
+
+def bump_data_version(*tables):
+    if _shared_store is not None:
+        _shared_store.bump(*tables)
+        return
+    with _versions_lock:
+        for t in tables:
+            _versions[t.lower()] = _versions.get(t.lower(), 0) + 1
+
+
+def estimate_size(value, _seen=None):
+    _seen = set() if _seen is None else _seen
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, _seen) for v in value)
+    elif hasattr(value, "__slots__"):
+        size += sum(estimate_size(getattr(value, s, None), _seen) for s in value.__slots__)
+    elif hasattr(value, "__dict__"):
+        size += estimate_size(vars(value), _seen)
+    return size
+
+
+def _older(version, than):
+    # Versions are per-table counters that only grow, so one is older when no table is ahead of `than`.
+    return version != than and all(a <= b for a, b in zip(version, than))
+
+
+class VersionedCache:
+    def __init__(self, tables, ttl=None, max_bytes=None, sizer=estimate_size, name=None, shared=False):
+        self.tables = tuple(tables)
+        self.shared = shared and bool(name)
+        self.ttl = ttl or None
+        self.max_bytes = max_bytes or None
+        self.sizer = sizer
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.name = name
+        if name:
+            _named_caches[name] = self
+
+    def _lookup(self, key, version):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry_version, stored_at, _, value = entry
+        if entry_version != version and not _older(entry_version, version):
+            # Stored by a reader that saw a later write; a miss for this (stale) caller, kept for the next.
+            return None
+        if entry_version != version or (self.ttl and time.monotonic() - stored_at > self.ttl):
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _drop(self, key):
+        _, _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get_or_compute(self, key, compute):
+        version = data_version(*self.tables)
+        with self._lock:
+            entry = self._lookup(key, version)
+            if entry is not None:
+                self.hits += 1
+                return entry[3]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            try:
+                with self._lock:
+                    entry = self._lookup(key, version)
+                    if entry is not None:
+                        self.hits += 1
+                        return entry[3]
+                    self.misses += 1
+                if self.shared and _shared_store is not None:
+                    value = _shared_store.get_or_compute(self.name, key, version, compute)
+                else:
+                    value = compute()
+                size = self.sizer(value) if self.max_bytes else 0
+                with self._lock:
+                    # Only entries older than this version are stale; a concurrent fill may already have
+                    # stored results for a newer one, which this (slower) fill must not evict or replace.
+                    for stale in [k for k, e in self._entries.items() if _older(e[0], version)]:
+                        self._drop(stale)
+                    current = self._entries.get(key)
+                    if current is not None and _older(version, current[0]):
+                        return value
+                    if current is not None:
+                        self._drop(key)
+                    if not self.max_bytes or size <= self.max_bytes:
+                        self._entries[key] = (version, time.monotonic(), size, value)
+                        self._bytes += size
+                    while self.max_bytes and self._bytes > self.max_bytes:
+                        self._drop(next(iter(self._entries)))
+                        self.evictions += 1
+                return value
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+
+def clear_caches():
+    for cache in _named_caches.values():
+        cache.clear()
+
+
+def cache_stats():
+    stats = {name: cache.stats() for name, cache in _named_caches.items()}
+    if _shared_store is not None:
+        stats["shared"] = _shared_store.stats()
+    return stats
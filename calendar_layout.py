@@ -0,0 +1,64 @@
+import datetime
+import heapq
+
+import numpy as np
+
+from event_model import DaySlot
+
+
+def assign_lanes(intervals):
+    # intervals: (start, end) pairs with inclusive ends, sorted by (start, -length).
+    # Each interval gets the lowest lane whose previous occupant ended before it starts,
+    # which is exactly what probing lane 0, 1, 2... day by day produces.
+    busy = []
+    free = []
+    lanes = []
+    next_lane = 0
+    for start, end in intervals:
+        while busy and busy[0][0] < start:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        if free:
+            lane = heapq.heappop(free)
+        else:
+            lane = next_lane
+            next_lane += 1
+        heapq.heappush(busy, (end, lane))
+        lanes.append(lane)
+    return lanes
+
+
+def layout_spans(table):
+    # Returns the EventTable in calendar order with a parallel array of lanes: one
+    # run-length span (lane, start_ord, end_ord) per event instead of an entry per day.
+    table = table.take(table.calendar_order())
+    lanes = assign_lanes(zip(table.start_ord.tolist(), table.end_ord.tolist()))
+    return table, np.array(lanes, dtype=np.int32)
+
+
+def spans_to_day_slots(table, lanes, window_start=None, window_end=None):
+    # Expands spans into {date: {lane: DaySlot}} for the days inside [window_start, window_end).
+    lo = window_start.toordinal() if window_start is not None else None
+    hi = window_end.toordinal() - 1 if window_end is not None else None
+    mask = np.ones(len(table), dtype=bool)
+    if lo is not None:
+        mask &= table.end_ord >= lo
+    if hi is not None:
+        mask &= table.start_ord <= hi
+    day_slots = {}
+    for i in np.flatnonzero(mask).tolist():
+        evt = table.records[i]
+        lane = int(lanes[i])
+        start, end = int(table.start_ord[i]), int(table.end_ord[i])
+        first = start if lo is None else max(start, lo)
+        last = end if hi is None else min(end, hi)
+        for current in range(first, last + 1):
+            if start == end:
+                pos_type = "evt-single"
+            elif current == start:
+                pos_type = "evt-start"
+            elif current == end:
+                pos_type = "evt-end"
+            else:
+                pos_type = "evt-mid"
+            day_slots.setdefault(datetime.date.fromordinal(current), {})[lane] = DaySlot(pos_type, evt)
+    return day_slots
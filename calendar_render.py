@@ -0,0 +1,84 @@
+import calendar
+import datetime
+from html import escape
+
+from cache import VersionedCache
+from utils import fetch_and_process_events_for_calendar, calendar_window, setting
+
+MODES = {
+    "full": {
+        "table": "cal-table", "th": "cal-th", "td": "cal-td", "empty": "cal-td cal-empty",
+        "day": "cal-day", "event": "cal-event", "spacer": "cal-spacer",
+        "headers": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"], "max_lanes": None, "text": True,
+    },
+    "compact": {
+        "table": "sidebar-cal-table", "th": "sidebar-cal-th", "td": "sidebar-cal-td",
+        "empty": "sidebar-cal-td sidebar-cal-empty", "day": "sidebar-cal-day", "event": "sidebar-cal-event",
+        "spacer": "sidebar-cal-spacer", "headers": ["M", "T", "W", "T", "F", "S", "S"], "max_lanes": 2, "text": False,
+    },
+}
+
+_HEAD = {
+    mode: f"<table class='{cfg['table']}'><thead><tr>"
+          + "".join(f"<th class='{cfg['th']}'>{day}</th>" for day in cfg["headers"])
+          + "</tr></thead><tbody>"
+    for mode, cfg in MODES.items()
+}
+_EMPTY = {mode: f"<td class='{cfg['empty']}'></td>" for mode, cfg in MODES.items()}
+_SPACER = {mode: f"<div class='{cfg['spacer']}'></div>" for mode, cfg in MODES.items()}
+
+_html_cache = VersionedCache(
+    ("Event", "Location"),
+    max_bytes=int(float(setting("calendar_html_cache_max_mb", 16)) * 1024 * 1024),
+    name="calendar_html",
+    shared=True,
+)
+
+
+def _slot_html(slot, cfg):
+    text = slot.text if cfg["text"] else ""
+    return (f"<div class='{cfg['event']} {slot.type}' style='background-color: {slot.color};' "
+            f"title='{escape(slot.tooltip)}'>{escape(text) if text != '&nbsp;' else text}</div>")
+
+
+def _cell_html(day, slots, mode, cfg):
+    parts = [f"<td class='{cfg['td']}'><span class='{cfg['day']}'>{day}</span>"]
+    if slots is not None:
+        lanes = cfg["max_lanes"] or (max(slots) + 1 if slots else 0)
+        for lane in range(lanes):
+            slot = slots.get(lane)
+            parts.append(_slot_html(slot, cfg) if slot is not None else _SPACER[mode])
+    parts.append("</td>")
+    return "".join(parts)
+
+
+def build_month_html(year, month, mode, day_slots):
+    cfg = MODES[mode]
+    parts = [_HEAD[mode]]
+    for week in calendar.monthcalendar(year, month):
+        parts.append("<tr>")
+        for day in week:
+            if day == 0:
+                parts.append(_EMPTY[mode])
+            else:
+                parts.append(_cell_html(day, day_slots.get(datetime.date(year, month, day)), mode, cfg))
+        parts.append("</tr>")
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
+
+def render_month(year, month, mode="full", window=None):
+    window = window or calendar_window(year, month)
+
+    def build():
+        day_slots, _, _ = fetch_and_process_events_for_calendar(*window)
+        return build_month_html(year, month, mode, day_slots)
+
+    return _html_cache.get_or_compute((year, month, mode, window), build)
+
+
+def render_legend(loc_color_map):
+    return ("<div style='margin-bottom: 5px; font-size: 11px;'>"
+            + "".join(f"<span style='margin-right:10px;'><span style='color:{color};'>●</span> {escape(loc)}</span>"
+                      for loc, color in loc_color_map.items())
+            + "</div>")
@@ -1,6 +1,7 @@
 import streamlit as st
 import datetime
 from utils import run_query
+from image_cache import fetch_event_image
 
 st.title("🎫 Event Status Checker")
 
@@ -21,12 +22,13 @@ with col_details:
         else:
             event_id_input = int(event_id_str)
             with st.spinner("Searching database..."):
-                sql = "SELECT evn_name, evn_status, evn_organizer, evn_start_date, evn_admin_comment, evn_image FROM Event WHERE event_id = ?"
+                sql = "SELECT evn_name, evn_status, evn_organizer, evn_start_date, evn_admin_comment FROM Event WHERE event_id = ?"
                 rows = run_query(sql, (event_id_input,))
             
             if rows:
                 row = rows[0]
-                name, status, organizer, s_date, admin_comment, img_data = row
+                name, status, organizer, s_date, admin_comment = row
+                img_data = fetch_event_image(event_id_input)
                 
                 if isinstance(s_date, datetime.datetime):
                     date_display = s_date.strftime("%B %d, %Y at %I:%M %p")
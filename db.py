@@ -0,0 +1,445 @@
+import collections
+import datetime
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "SQL QUERY.txt")
+
+
+class MSSQLBackend:
+    name = "mssql"
+
+    def __init__(self, server, database, username, password, driver="ODBC Driver 17 for SQL Server"):
+        self.server = server
+        self.database = database
+        self.username = username
+        self.password = password
+        self.driver = driver
+
+    def connect(self):
+        import pyodbc
+        return pyodbc.connect(
+            "DRIVER={" + self.driver + "};SERVER="
+            + self.server
+            + ";DATABASE="
+            + self.database
+            + ";UID="
+            + self.username
+            + ";PWD="
+            + self.password
+        )
+
+    def translate(self, sql):
+        return sql
+
+
+class SQLiteBackend:
+    name = "sqlite"
+
+    def __init__(self, path="eventdb.sqlite3", schema_file=SCHEMA_FILE):
+        self.uri = path.startswith("file:")
+        self.path = path
+        if path == ":memory:":
+            self.path = f"file:eventdb-{uuid.uuid4().hex}?mode=memory&cache=shared"
+            self.uri = True
+        self.schema_file = schema_file
+        self._anchor = None
+        self._schema_ready = False
+        self._lock = threading.Lock()
+        self._translated = {}
+
+    def connect(self):
+        conn = sqlite3.connect(
+            self.path, uri=self.uri, timeout=30,
+            detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False
+        )
+        conn.execute("PRAGMA foreign_keys = ON")
+        if "mode=memory" not in self.path:
+            conn.execute("PRAGMA journal_mode = WAL")
+        with self._lock:
+            if not self._schema_ready:
+                if "mode=memory" in self.path:
+                    # An in-memory database lives only while a connection holds it open.
+                    self._anchor = conn
+                    conn = sqlite3.connect(
+                        self.path, uri=True, timeout=30,
+                        detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False
+                    )
+                    conn.execute("PRAGMA foreign_keys = ON")
+                self.init_schema(conn)
+                self._schema_ready = True
+        return conn
+
+    def translate(self, sql):
+        translated = self._translated.get(sql)
+        if translated is None:
+            translated = translate_tsql(sql)
+            if len(self._translated) > 1024:
+                self._translated.clear()
+            self._translated[sql] = translated
+        return translated
+
+    def init_schema(self, conn):
+        with open(self.schema_file, encoding="utf-8") as f:
+            script = f.read()
+        for batch in split_batches(script):
+            run_batch(conn, batch)
+        conn.commit()
+
+
+def backend_from_config(config):
+    name = config.get("backend", "mssql")
+    if name == "sqlite":
+        return SQLiteBackend(config.get("sqlite_path", "eventdb.sqlite3"))
+    if name == "mssql":
+        return MSSQLBackend(
+            config["server"], config["database"], config["username"], config["password"],
+            driver=config.get("driver", "ODBC Driver 17 for SQL Server")
+        )
+    raise ValueError(f"Unknown database backend: {name}")
+
+
+# --- SQLite type handling -------------------------------------------------
+
+def _adapt_datetime(value):
+    return value.isoformat(" ", timespec="seconds" if not value.microsecond else "microseconds")
+
+
+def _adapt_date(value):
+    return value.isoformat() + " 00:00:00"
+
+
+def _convert_datetime(value):
+    return datetime.datetime.fromisoformat(value.decode())
+
+
+sqlite3.register_adapter(datetime.datetime, _adapt_datetime)
+sqlite3.register_adapter(datetime.date, _adapt_date)
+sqlite3.register_converter("DATETIME", _convert_datetime)
+
+
+# --- T-SQL -> SQLite translation --------------------------------------------
+
+_DATEADD_UNITS = {
+    "year": "years", "yy": "years", "yyyy": "years",
+    "month": "months", "mm": "months", "m": "months",
+    "day": "days", "dd": "days", "d": "days",
+    "hour": "hours", "hh": "hours",
+    "minute": "minutes", "mi": "minutes", "n": "minutes",
+    "second": "seconds", "ss": "seconds", "s": "seconds",
+}
+_FORMAT_TOKENS = [("yyyy", "%Y"), ("MM", "%m"), ("dd", "%d"), ("HH", "%H"), ("mm", "%M"), ("ss", "%S")]
+
+
+def _matching_paren(sql, open_pos):
+    depth = 0
+    quoted = False
+    for i in range(open_pos, len(sql)):
+        ch = sql[i]
+        if ch == "'":
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+    raise ValueError("Unbalanced parentheses in SQL")
+
+
+def _split_args(text):
+    args, depth, quoted, start = [], 0, False, 0
+    for i, ch in enumerate(text):
+        if ch == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            args.append(text[start:i].strip())
+            start = i + 1
+    args.append(text[start:].strip())
+    return args
+
+
+def _rewrite_calls(sql, name, rewrite):
+    pattern = re.compile(r"\b" + name + r"\s*\(", re.IGNORECASE)
+    out, pos = [], 0
+    while True:
+        m = pattern.search(sql, pos)
+        if not m:
+            break
+        close = _matching_paren(sql, m.end() - 1)
+        args = [_rewrite_calls(a, name, rewrite) for a in _split_args(sql[m.end():close])]
+        out.append(sql[pos:m.start()])
+        out.append(rewrite(args))
+        pos = close + 1
+    out.append(sql[pos:])
+    return "".join(out)
+
+
+def _dateadd(args):
+    unit, number, expr = args
+    unit = unit.lower()
+    if unit in ("week", "wk", "ww"):
+        return f"datetime({expr}, (({number}) * 7) || ' days')"
+    return f"datetime({expr}, ({number}) || ' {_DATEADD_UNITS[unit]}')"
+
+
+def _format(args):
+    expr, fmt = args
+    fmt = fmt.strip("'")
+    for token, replacement in _FORMAT_TOKENS:
+        fmt = fmt.replace(token, replacement)
+    return f"strftime('{fmt}', {expr})"
+
+
+def translate_tsql(sql):
+    sql = re.sub(r"\bGETDATE\s*\(\s*\)", "datetime('now', 'localtime')", sql, flags=re.IGNORECASE)
+    sql = _rewrite_calls(sql, "DATEADD", _dateadd)
+    sql = _rewrite_calls(sql, "FORMAT", _format)
+    sql = re.sub(r"\bISNULL\s*\(", "IFNULL(", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\b(DATALENGTH|LEN)\s*\(", "LENGTH(", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bN'", "'", sql)
+
+    sql = re.sub(r"\bOFFSET\s+(\S+)\s+ROWS\s+FETCH\s+(?:NEXT|FIRST)\s+(\S+)\s+ROWS\s+ONLY\b",
+                 r"LIMIT \1, \2", sql, flags=re.IGNORECASE)
+
+    suffix = []
+    m = re.search(r"\bOUTPUT\s+INSERTED\.(\w+)", sql, flags=re.IGNORECASE)
+    if m:
+        sql = sql[:m.start()] + sql[m.end():]
+        suffix.append(f"RETURNING {m.group(1)}")
+    m = re.search(r"\bSELECT\s+TOP\s*\(?\s*(\d+)\s*\)?", sql, flags=re.IGNORECASE)
+    if m:
+        sql = sql[:m.start()] + "SELECT " + sql[m.end():]
+        suffix.insert(0, f"LIMIT {m.group(1)}")
+    if suffix:
+        sql = sql.rstrip().rstrip(";").rstrip() + "\n" + " ".join(suffix)
+    return sql
+
+
+# --- Schema script runner ---------------------------------------------------
+
+_IF_NOT_EXISTS = re.compile(r"\s*IF\s+NOT\s+EXISTS\s*\(", re.IGNORECASE)
+_BEGIN = re.compile(r"\s*BEGIN\b", re.IGNORECASE)
+_END = re.compile(r"\bEND\b", re.IGNORECASE)
+
+
+def split_batches(script):
+    script = re.sub(r"--[^\n]*", "", script)
+    return [b for b in re.split(r"^\s*GO\s*$", script, flags=re.IGNORECASE | re.MULTILINE) if b.strip()]
+
+
+def _statements(text):
+    statements, quoted, depth, start = [], False, 0, 0
+    for i, ch in enumerate(text):
+        if ch == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == ";" and depth == 0:
+            statements.append(text[start:i])
+            start = i + 1
+    statements.append(text[start:])
+    return [s.strip() for s in statements if s.strip()]
+
+
+def translate_ddl(sql):
+    sql = re.sub(
+        r"\bsysobjects\s+WHERE\s+name\s*=\s*'(\w+)'\s+AND\s+xtype\s*=\s*'U'",
+        r"sqlite_master WHERE type = 'table' AND name = '\1'", sql, flags=re.IGNORECASE
+    )
+    sql = re.sub(
+        r"\bsys\.indexes\s+WHERE\s+name\s*=\s*'(\w+)'(\s+AND\s+object_id\s*=\s*OBJECT_ID\('\w+'\))?",
+        r"sqlite_master WHERE type = 'index' AND name = '\1'", sql, flags=re.IGNORECASE
+    )
+    sql = re.sub(
+        r"\bsys\.columns\s+WHERE\s+name\s*=\s*'(\w+)'\s+AND\s+object_id\s*=\s*OBJECT_ID\('(\w+)'\)",
+        r"pragma_table_info('\2') WHERE name = '\1'", sql, flags=re.IGNORECASE
+    )
+    sql = re.sub(r"\bINT\s+IDENTITY\s*\(\s*1\s*,\s*1\s*\)\s+PRIMARY\s+KEY", "INTEGER PRIMARY KEY AUTOINCREMENT",
+                 sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bNVARCHAR\s*\(\s*(\d+|MAX)\s*\)", "TEXT", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bVARBINARY\s*\(\s*(\d+|MAX)\s*\)", "BLOB", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\b(NON)?CLUSTERED\s+INDEX\b", "INDEX", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bINCLUDE\s*\([^)]*\)", "", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\b(ALTER\s+TABLE\s+\w+\s+ADD)\s+(?!COLUMN\b)", r"\1 COLUMN ", sql, flags=re.IGNORECASE)
+    return translate_tsql(sql)
+
+
+def _run_statements(conn, text):
+    for stmt in _statements(text):
+        if re.match(r"(CREATE\s+DATABASE|USE)\b", stmt, flags=re.IGNORECASE):
+            continue
+        conn.execute(translate_ddl(stmt))
+
+
+def run_batch(conn, batch):
+    pos = 0
+    while pos < len(batch):
+        m = _IF_NOT_EXISTS.search(batch, pos)
+        if not m:
+            _run_statements(conn, batch[pos:])
+            return
+        _run_statements(conn, batch[pos:m.start()])
+        cond_end = _matching_paren(batch, m.end() - 1)
+        condition = batch[m.end():cond_end]
+        begin = _BEGIN.match(batch, cond_end + 1)
+        end = _END.search(batch, begin.end())
+        exists = conn.execute(f"SELECT EXISTS ({translate_ddl(condition)})").fetchone()[0]
+        if not exists:
+            _run_statements(conn, batch[begin.end():end.start()])
+        pos = end.end()
+
+
+# --- Connection pool ---------------------------------------------------------
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, backend, min_size=1, max_size=10, timeout=30.0, health_check=True):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.backend = backend
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check = health_check
+        self._idle = collections.deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0, "waits": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0,
+            "timeouts": 0, "created": 0, "discarded": 0, "reconnects": 0,
+        }
+        for _ in range(min_size):
+            self._size += 1
+            self._idle.append(self._connect())
+
+    def _connect(self):
+        try:
+            conn = self.backend.connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["created"] += 1
+        return conn
+
+    def _is_alive(self, conn):
+        try:
+            cur = conn.cursor()
+            try:
+                cur.execute("SELECT 1")
+                cur.fetchall()
+            finally:
+                cur.close()
+            return True
+        except Exception:
+            return False
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        conn = None
+        waited = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(f"No database connection available within {timeout:.1f}s")
+                waited = True
+                self._cond.wait(remaining)
+            elapsed = time.monotonic() - started
+            self._stats["checkouts"] += 1
+            if waited:
+                self._stats["waits"] += 1
+                self._stats["wait_seconds_total"] += elapsed
+                self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], elapsed)
+
+        if conn is None:
+            return self._connect()
+        if self.health_check and not self._is_alive(conn):
+            self._close(conn)
+            with self._cond:
+                self._stats["discarded"] += 1
+                self._stats["reconnects"] += 1
+            return self._connect()
+        return conn
+
+    def release(self, conn, discard=False):
+        # After close(), connections still checked out are closed as they come back.
+        with self._cond:
+            retire = discard or self._closed
+            if retire:
+                self._size -= 1
+            else:
+                self._idle.append(conn)
+            if discard:
+                self._stats["discarded"] += 1
+            self._cond.notify()
+        if retire:
+            self._close(conn)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        except BaseException:
+            try:
+                conn.rollback()
+                broken = False
+            except Exception:
+                broken = True
+            self.release(conn, discard=broken)
+            raise
+        self.release(conn)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), collections.deque()
+            self._size -= len(idle)
+        for conn in idle:
+            self._close(conn)
+
+    def metrics(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update(size=self._size, idle=len(self._idle), in_use=self._size - len(self._idle),
+                         min_size=self.min_size, max_size=self.max_size)
+        stats["wait_seconds_avg"] = stats["wait_seconds_total"] / stats["waits"] if stats["waits"] else 0.0
+        return stats
@@ -0,0 +1,135 @@
+import bisect
+import datetime
+import threading
+import time
+from collections import Counter
+
+STATUSES = ("Pending", "Approved", "Declined")
+
+
+class StatusCounters:
+    # Event counts per status plus the start times of events in a rolling window, kept in step
+    # with the Event table through the change feed. `status_loader` returns (event_id, status) rows;
+    # `upcoming_loader(start, until)` returns [(start, event_id), ...] for starts in [start, until).
+    # Both are held per event, so a change a rebuild has already seen (committed, version not yet
+    # bumped) replaces that event's entry instead of being counted twice.
+    # Only the next `horizon_days` (+ `margin_days`, so refills happen about once per margin) are
+    # held; the window is refilled when it rolls past what was loaded. A background job started with
+    # schedule_reconcile() rebuilds everything periodically and records any drift.
+
+    def __init__(self, status_loader, upcoming_loader, version, horizon_days=7, margin_days=1):
+        self.status_loader = status_loader
+        self.upcoming_loader = upcoming_loader
+        self.version_source = version
+        self.horizon = datetime.timedelta(days=horizon_days)
+        self.margin = datetime.timedelta(days=margin_days)
+        self._statuses = {}
+        self._counts = {}
+        self._upcoming = []
+        self._upcoming_starts = {}
+        self._loaded_until = None
+        self._version = None
+        self._lock = threading.RLock()
+        self._reconciler = None
+        self.rebuilds = 0
+        self.refills = 0
+        self.reconcile_errors = 0
+        self.drift = 0
+
+    def _refill(self, now):
+        until = now + self.horizon + self.margin
+        self._upcoming = sorted(tuple(row) for row in self.upcoming_loader(now, until))
+        self._upcoming_starts = {event_id: start for start, event_id in self._upcoming}
+        self._loaded_until = until
+        self.refills += 1
+
+    def _rebuild(self, now=None):
+        version = self.version_source()
+        statuses = dict(self.status_loader())
+        counts = dict(Counter(statuses.values()))
+        if self._version is not None and counts != {k: v for k, v in self._counts.items() if v}:
+            self.drift += 1
+        self._statuses, self._counts = statuses, counts
+        self._refill(now or datetime.datetime.now())
+        self._version = version
+        self.rebuilds += 1
+
+    def _ensure_current(self, now):
+        if self._version is None or self._version != self.version_source():
+            self._rebuild(now)
+        elif now + self.horizon > self._loaded_until:
+            self._refill(now)
+
+    def apply_change(self, before, after, version):
+        with self._lock:
+            if self._version is None or version != self._version + 1:
+                self._version = None
+                return
+            event_id = (after or before)["event_id"]
+            self._discard(event_id)
+            if after is not None:
+                self._statuses[event_id] = after["status"]
+                self._counts[after["status"]] = self._counts.get(after["status"], 0) + 1
+                start = after["start"]
+                if start is not None and datetime.datetime.now() <= start < self._loaded_until:
+                    bisect.insort(self._upcoming, (start, event_id))
+                    self._upcoming_starts[event_id] = start
+            self._version = version
+
+    def _discard(self, event_id):
+        status = self._statuses.pop(event_id, None)
+        if status is not None:
+            self._counts[status] -= 1
+        start = self._upcoming_starts.pop(event_id, None)
+        if start is not None:
+            i = bisect.bisect_left(self._upcoming, (start, event_id))
+            if i < len(self._upcoming) and self._upcoming[i] == (start, event_id):
+                del self._upcoming[i]
+
+    def snapshot(self, now=None):
+        now = now or datetime.datetime.now()
+        with self._lock:
+            self._ensure_current(now)
+            # Events that have started drop out of the rolling bucket for good.
+            started = bisect.bisect_left(self._upcoming, (now,))
+            for _, event_id in self._upcoming[:started]:
+                del self._upcoming_starts[event_id]
+            del self._upcoming[:started]
+            soon = bisect.bisect_right(self._upcoming, (now + self.horizon, float("inf")))
+            result = {"Total": sum(self._counts.values()), "Soon": soon}
+            result.update({status: self._counts.get(status, 0) for status in STATUSES})
+            return result
+
+    def reconcile(self):
+        with self._lock:
+            self._rebuild()
+            return self.drift
+
+    def schedule_reconcile(self, interval):
+        # One daemon thread per process; failures (e.g. the database being down) are counted and retried next time.
+        if not interval or self._reconciler is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.reconcile()
+                except Exception:
+                    with self._lock:
+                        self.reconcile_errors += 1
+
+        self._reconciler = threading.Thread(target=run, name="status-counters-reconcile", daemon=True)
+        self._reconciler.start()
+
+    def invalidate(self):
+        with self._lock:
+            self._version = None
+
+    def stats(self):
+        with self._lock:
+            return {"statuses": {status: n for status, n in self._counts.items() if n},
+                    "upcoming": len(self._upcoming),
+                    "loaded_until": self._loaded_until.isoformat(timespec="seconds") if self._loaded_until else None,
+                    "version": self._version, "rebuilds": self.rebuilds, "refills": self.refills,
+                    "drift": self.drift, "reconcile_errors": self.reconcile_errors}
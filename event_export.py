@@ -0,0 +1,43 @@
+import csv
+import io
+import tempfile
+
+from openpyxl import Workbook
+
+from event_queries import EVENT_LIST_COLUMNS, iter_event_rows
+
+EXPORT_COLUMNS = [c for c in EVENT_LIST_COLUMNS if c != "Loc_ID"]
+_KEEP = [i for i, c in enumerate(EVENT_LIST_COLUMNS) if c != "Loc_ID"]
+BATCH_SIZE = 2000
+
+
+def _rows(status, search):
+    for row in iter_event_rows(status, search, BATCH_SIZE):
+        yield [row[i] for i in _KEEP]
+
+
+def export_xlsx(status="All", search=""):
+    # Rows stream from the cursor into a write-only workbook spooled to disk; st.download_button
+    # only accepts str/bytes/BytesIO-like data, so the finished file is handed back as bytes.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Events")
+    ws.append(EXPORT_COLUMNS)
+    for row in _rows(status, search):
+        ws.append(row)
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as out:
+        wb.save(out)
+        out.seek(0)
+        return out.read()
+
+
+def export_csv(status="All", search=""):
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as out:
+        text = io.TextIOWrapper(out, encoding="utf-8-sig", newline="")
+        writer = csv.writer(text)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in _rows(status, search):
+            writer.writerow(row)
+        text.flush()
+        text.detach()
+        out.seek(0)
+        return out.read()
@@ -1,8 +1,12 @@
 import streamlit as st
 import pandas as pd
 import datetime
-import io 
-from utils import run_query, execute_update, get_time_slots
+from utils import execute_update, get_time_slots
+from location_catalog import location_catalog
+from image_cache import fetch_event_image, invalidate_event_image
+from event_queries import EVENT_LIST_COLUMNS, count_events, fetch_event_page, fetch_event_metrics
+from event_export import export_xlsx, export_csv
+from occupancy import occupancy
 
 @st.dialog("Confirm Status Update")
 def confirm_status_change(event_id, event_name, new_status):
@@ -16,7 +20,7 @@ def confirm_status_change(event_id, event_name, new_status):
     with col1:
         if st.button("Yes, Update", type="primary", use_container_width=True):
             sql = "UPDATE Event SET evn_status=?, evn_admin_comment=? WHERE event_id=?"
-            if execute_update(sql, (new_status, admin_note, event_id)):
+            if execute_update(sql, (new_status, admin_note, event_id), event_id=event_id, check_booking=True):
                 st.success(f"Status updated to {new_status}"); st.rerun()
     with col2:
         if st.button("Cancel", use_container_width=True): st.rerun()
@@ -28,40 +32,31 @@ def confirm_delete(event_id, event_name):
     col1, col2 = st.columns(2)
     with col1:
         if st.button("Yes, Delete", type="primary", use_container_width=True):
-            sql = "DELETE FROM Event WHERE event_id=?"; execute_update(sql, (event_id,)); st.success("Deleted."); st.rerun()
+            sql = "DELETE FROM Event WHERE event_id=?"; execute_update(sql, (event_id,), event_id=event_id); invalidate_event_image(event_id); st.success("Deleted."); st.rerun()
     with col2:
         if st.button("Cancel", use_container_width=True): st.rerun()
 
 st.title("📊 Event Command Center")
 st.write("Overview, approval, and management of campus events.")
 
+PAGE_SIZE = 50
+
 try:
-    fetch_sql = """
-        SELECT E.event_id, E.evn_name, E.evn_type, E.evn_start_date, E.evn_end_date, 
-               E.evn_organizer, E.evn_description, L.loc_name, E.evn_status, E.location_id, E.evn_image
-        FROM Event E LEFT JOIN Location L ON E.location_id = L.location_id
-    """
-    rows = run_query(fetch_sql)
-    columns = ["ID", "Name", "Type", "Start", "End", "Organizer", "Description", "Location", "Status", "Loc_ID", "Image"]
-    df = pd.DataFrame.from_records(rows, columns=columns)
+    metrics = fetch_event_metrics()
 except Exception as e:
-    st.error(f"Database Error: {e}"); df = pd.DataFrame()
+    st.error(f"Database Error: {e}"); metrics = {"Total": 0}
 
 col_metric, col_export = st.columns([3, 1])
 with col_metric:
-    if not df.empty:
+    if metrics["Total"]:
         m1, m2, m3, m4 = st.columns(4)
-        m1.metric("Total", len(df))
-        m2.metric("Pending", len(df[df["Status"]=="Pending"]))
-        m3.metric("Approved", len(df[df["Status"]=="Approved"]))
-        m4.metric("Declined", len(df[df["Status"]=="Declined"]))
+        m1.metric("Total", metrics["Total"])
+        m2.metric("Pending", metrics["Pending"])
+        m3.metric("Approved", metrics["Approved"])
+        m4.metric("Declined", metrics["Declined"])
 with col_export:
     st.write("") 
-    if not df.empty:
-        buffer = io.BytesIO()
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Events')
-        st.download_button("📥 Export Excel", data=buffer.getvalue(), file_name="events_report.xlsx", mime="application/vnd.ms-excel", use_container_width=True)
+    export_slot = st.container()
 
 st.divider()
 
@@ -71,17 +66,43 @@ with c_filter:
 with c_search:
     search_term = st.text_input("🔍 Search Events", placeholder="Search by event name...", label_visibility="collapsed")
 
-if not df.empty:
-    if filter_status != "All": df = df[df["Status"] == filter_status]
-    if search_term: df = df[df["Name"].str.contains(search_term, case=False, na=False)]
+if st.session_state.get("evt_filter") != (filter_status, search_term):
+    st.session_state.evt_filter = (filter_status, search_term)
+    st.session_state.evt_page = 1
 
-st.caption(f"Showing {len(df)} records")
+try:
+    total_rows = count_events(filter_status, search_term)
+    page_count = max(1, -(-total_rows // PAGE_SIZE))
+    page = st.session_state.evt_page = min(st.session_state.get("evt_page", 1), page_count)
+    rows = fetch_event_page(filter_status, search_term, page, PAGE_SIZE)
+    df = pd.DataFrame.from_records(rows, columns=EVENT_LIST_COLUMNS)
+except Exception as e:
+    st.error(f"Database Error: {e}"); df = pd.DataFrame(); total_rows = 0; page = page_count = 1
+
+with export_slot:
+    if total_rows:
+        x1, x2 = st.columns([2, 1])
+        x1.download_button(
+            "📥 Export Excel", data=lambda: export_xlsx(filter_status, search_term), file_name="events_report.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True
+        )
+        x2.download_button(
+            "CSV", data=lambda: export_csv(filter_status, search_term), file_name="events_report.csv",
+            mime="text/csv", use_container_width=True
+        )
+
+c_caption, c_page = st.columns([4, 1])
+with c_caption:
+    first_row = (page - 1) * PAGE_SIZE + 1 if total_rows else 0
+    st.caption(f"Showing {first_row}–{first_row + len(df) - 1 if total_rows else 0} of {total_rows} records")
+with c_page:
+    if page_count > 1:
+        st.number_input("Page", min_value=1, max_value=page_count, key="evt_page", label_visibility="collapsed")
 
 event_table = st.dataframe(
     df, use_container_width=True, hide_index=True, selection_mode="single-row", on_select="rerun",
     column_config={
         "Loc_ID": None,
-        "Image": None, 
         "Status": st.column_config.TextColumn("Status", validate="^(Pending|Approved|Declined)$"),
         "Start": st.column_config.DatetimeColumn("Start Date", format="MMM DD, YYYY h:mm a"),
         "End": st.column_config.DatetimeColumn("End Date", format="MMM DD, YYYY h:mm a")
@@ -92,13 +113,15 @@ if len(event_table.selection.rows) > 0:
     selected_index = event_table.selection.rows[0]; selected_row = df.iloc[selected_index]
     current_id = int(selected_row["ID"]); current_name = selected_row["Name"]
     current_status = selected_row["Status"]; current_loc_id = selected_row["Loc_ID"]
-    current_image = selected_row["Image"] 
+    current_image = fetch_event_image(current_id, "thumb")
     
     with st.container(border=True):
         st.subheader(f"⚙️ Managing: {current_name}")
         
         if current_image:
             st.markdown("**🖼️ Event Poster**")
+            if st.toggle("Show full-size poster", key=f"poster_full_{current_id}"):
+                current_image = fetch_event_image(current_id, "display")
             st.image(current_image, caption=f"Poster for {current_name}", use_container_width=True)
             st.divider()
         
@@ -106,15 +129,21 @@ if len(event_table.selection.rows) > 0:
         
         with tab_approve:
             st.info(f"Current Status: **{current_status}**")
+            if pd.notna(current_loc_id):
+                load_start = pd.to_datetime(selected_row["Start"]).date()
+                load = occupancy(load_start, load_start + datetime.timedelta(days=29)).location_utilization(int(current_loc_id))
+                if load is not None:
+                    st.caption(f"📍 {selected_row['Location']} is {load}% booked "
+                               f"(approved + pending) in the 30 days from this event's start.")
             b1, b2, b3 = st.columns(3)
             if b1.button("✅ Approve", use_container_width=True): confirm_status_change(current_id, current_name, "Approved")
             if b2.button("❌ Decline", use_container_width=True): confirm_status_change(current_id, current_name, "Declined")
             if b3.button("⏳ Reset", use_container_width=True): confirm_status_change(current_id, current_name, "Pending")
 
         with tab_edit:
-            loc_rows = run_query("SELECT location_id, loc_name FROM Location")
-            loc_map_id_to_name = {row[0]: row[1] for row in loc_rows}
-            loc_map_name_to_id = {row[1]: row[0] for row in loc_rows}
+            catalog = location_catalog()
+            loc_map_id_to_name = catalog.names
+            loc_map_name_to_id = catalog.ids
             
             with st.form("edit_event_form"):
                 c1, c2 = st.columns(2)
@@ -154,7 +183,7 @@ if len(event_table.selection.rows) > 0:
                     final_loc = loc_map_name_to_id[new_loc_name]
                     
                     sql = "UPDATE Event SET evn_name=?, evn_type=?, evn_organizer=?, evn_start_date=?, evn_end_date=?, evn_description=?, location_id=? WHERE event_id=?"
-                    if execute_update(sql, (new_name, new_type, new_organizer, final_start, final_end, new_desc, final_loc, current_id)):
+                    if execute_update(sql, (new_name, new_type, new_organizer, final_start, final_end, new_desc, final_loc, current_id), event_id=current_id, check_booking=True):
                         st.success("Updated!"); st.rerun()
 
         with tab_delete:
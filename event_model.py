@@ -0,0 +1,129 @@
+import calendar
+import datetime
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(slots=True, eq=False)
+class CalendarEvent:
+    name: str
+    dt_start: datetime.datetime
+    dt_end: datetime.datetime
+    location: str
+    desc: str
+    color: str
+
+    @property
+    def start(self):
+        return self.dt_start.date()
+
+    @property
+    def end(self):
+        return self.dt_end.date()
+
+    @property
+    def duration(self):
+        return (self.end - self.start).days + 1
+
+    @property
+    def tooltip(self):
+        return f"{self.name} @ {self.location}"
+
+
+class DaySlot:
+    __slots__ = ("type", "event")
+
+    def __init__(self, type, event):
+        self.type = type
+        self.event = event
+
+    @property
+    def color(self):
+        return self.event.color
+
+    @property
+    def tooltip(self):
+        return self.event.tooltip
+
+    @property
+    def text(self):
+        if self.type in ("evt-single", "evt-start"):
+            return self.event.location
+        return "&nbsp;" if self.type == "evt-mid" else ""
+
+
+class EventTable:
+    # Event records plus parallel NumPy columns (date ordinals, location codes) for filtering.
+    __slots__ = ("records", "start_ord", "end_ord", "loc_code", "locations")
+
+    def __init__(self, records, start_ord=None, end_ord=None, loc_code=None, locations=None):
+        self.records = records
+        if start_ord is None:
+            locations = sorted({r.location for r in records})
+            codes = {loc: i for i, loc in enumerate(locations)}
+            start_ord = np.fromiter((r.dt_start.toordinal() for r in records), dtype=np.int32, count=len(records))
+            end_ord = np.fromiter((r.dt_end.toordinal() for r in records), dtype=np.int32, count=len(records))
+            loc_code = np.fromiter((codes[r.location] for r in records), dtype=np.int32, count=len(records))
+        self.start_ord = start_ord
+        self.end_ord = end_ord
+        self.loc_code = loc_code
+        self.locations = locations
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(np.arange(len(self.records))[index])
+        return self.records[index]
+
+    def take(self, indices):
+        indices = np.asarray(indices, dtype=np.intp)
+        return EventTable(
+            [self.records[i] for i in indices.tolist()],
+            self.start_ord[indices], self.end_ord[indices], self.loc_code[indices], self.locations
+        )
+
+    def where(self, mask):
+        return self.take(np.flatnonzero(mask))
+
+    @property
+    def durations(self):
+        return self.end_ord - self.start_ord + 1
+
+    def calendar_order(self):
+        return np.lexsort((-self.durations, self.start_ord))
+
+    def overlapping(self, window_start, window_end):
+        return self.where((self.start_ord < window_end.toordinal()) & (self.end_ord >= window_start.toordinal()))
+
+    def in_month(self, year, month):
+        first = datetime.date(year, month, 1).toordinal()
+        last = first + calendar.monthrange(year, month)[1]
+        return self.where((self.start_ord >= first) & (self.start_ord < last))
+
+    def upcoming(self, today):
+        return self.where(self.end_ord >= today.toordinal())
+
+    def past(self, today):
+        return self.where(self.end_ord < today.toordinal())
+
+    def sorted_by_start(self, descending=False):
+        order = np.argsort(self.start_ord, kind="stable")
+        return self.take(order[::-1] if descending else order)
+
+    def color_map(self):
+        used = np.unique(self.loc_code)
+        first = {}
+        for record in self.records:
+            first.setdefault(record.location, record.color)
+        return {self.locations[code]: first[self.locations[code]] for code in used.tolist()}
+
+
+def make_event(name, dt_start, dt_end, location, desc, color):
+    return CalendarEvent(name, dt_start, dt_end, sys.intern(location), desc, sys.intern(color))
@@ -0,0 +1,45 @@
+from utils import run_query, iter_query, status_counters
+
+EVENT_LIST_COLUMNS = ["ID", "Name", "Type", "Start", "End", "Organizer", "Description", "Location", "Status", "Loc_ID"]
+
+_EVENT_LIST_SELECT = """
+        SELECT E.event_id, E.evn_name, E.evn_type, E.evn_start_date, E.evn_end_date, 
+               E.evn_organizer, E.evn_description, L.loc_name, E.evn_status, E.location_id
+        FROM Event E LEFT JOIN Location L ON E.location_id = L.location_id
+"""
+
+
+def _escape_like(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_").replace("[", "\\[")
+
+
+def event_filter(status="All", search=""):
+    clauses, params = [], []
+    if status and status != "All":
+        clauses.append("E.evn_status = ?")
+        params.append(status)
+    if search:
+        clauses.append("E.evn_name LIKE ? ESCAPE '\\'")
+        params.append(f"%{_escape_like(search)}%")
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def count_events(status="All", search=""):
+    where, params = event_filter(status, search)
+    return run_query("SELECT COUNT(*) FROM Event E" + where, params)[0][0]
+
+
+def fetch_event_page(status="All", search="", page=1, page_size=50):
+    where, params = event_filter(status, search)
+    sql = _EVENT_LIST_SELECT + where + " ORDER BY E.event_id OFFSET ? ROWS FETCH NEXT ? ROWS ONLY"
+    return run_query(sql, params + [(page - 1) * page_size, page_size])
+
+
+def fetch_event_metrics():
+    counts = status_counters.snapshot()
+    return {key: counts[key] for key in ("Total", "Pending", "Approved", "Declined")}
+
+
+def iter_event_rows(status="All", search="", batch_size=1000):
+    where, params = event_filter(status, search)
+    return iter_query(_EVENT_LIST_SELECT + where + " ORDER BY E.event_id", params, batch_size)
@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+
+from utils import run_query, setting, on_backend_change
+
+
+class ImageCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, loader):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        data = loader()
+        size = len(data) if data else 0
+        if size > self.max_bytes:
+            return data
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = data
+                self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted) if evicted else 0
+                self.evictions += 1
+        return data
+
+    def invalidate(self, match):
+        with self._lock:
+            for key in [k for k in self._entries if match(k)]:
+                data = self._entries.pop(key)
+                self._bytes -= len(data) if data else 0
+
+    def clear(self):
+        self.invalidate(lambda key: True)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_posters = ImageCache(int(float(setting("poster_cache_max_mb", 64)) * 1024 * 1024))
+on_backend_change(_posters.clear)
+
+
+_VARIANT_SQL = {
+    "display": "SELECT evn_image FROM Event WHERE event_id = ?",
+    # Rows stored before the image pipeline have no thumbnail until backfilled.
+    "thumb": "SELECT COALESCE(evn_thumb, evn_image) FROM Event WHERE event_id = ?",
+}
+
+
+def _load_event_image(event_id, variant):
+    rows = run_query(_VARIANT_SQL[variant], (event_id,))
+    return bytes(rows[0][0]) if rows and rows[0][0] else None
+
+
+def fetch_event_image(event_id, variant="display"):
+    key = (int(event_id), variant)
+    return _posters.get(key, lambda: _load_event_image(key[0], variant))
+
+
+def invalidate_event_image(event_id):
+    _posters.invalidate(lambda key: key[0] == int(event_id))
+
+
+def poster_cache_stats():
+    return _posters.stats()
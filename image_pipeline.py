@@ -0,0 +1,88 @@
+import argparse
+import io
+
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+DISPLAY_SIZE = (1280, 1280)
+THUMB_SIZE = (320, 320)
+DISPLAY_QUALITY = 80
+THUMB_QUALITY = 70
+# Checked from the header before decoding; a 50 MP photo decodes to ~200 MB of RGBA.
+MAX_PIXELS = 50_000_000
+
+
+def _encode(img, quality):
+    buffer = io.BytesIO()
+    if features.check("webp"):
+        img.save(buffer, format="WEBP", quality=quality, method=4)
+    else:
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        img.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def process_poster(raw, display_size=DISPLAY_SIZE, thumb_size=THUMB_SIZE, max_pixels=MAX_PIXELS):
+    # Returns (display, thumbnail) re-encoded without EXIF/ICC metadata.
+    try:
+        with Image.open(io.BytesIO(raw)) as src:
+            if src.width * src.height > max_pixels:
+                raise ValueError(f"Image is too large ({src.width}x{src.height}); the limit is {max_pixels / 1e6:g} MP")
+            img = ImageOps.exif_transpose(src)
+            img.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Unreadable image: {e}") from e
+
+    if img.mode not in ("RGB", "RGBA", "L"):
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+    img.info.clear()
+
+    display = img.copy()
+    display.thumbnail(display_size, Image.Resampling.LANCZOS)
+    thumb = display.copy()
+    thumb.thumbnail(thumb_size, Image.Resampling.LANCZOS)
+    return _encode(display, DISPLAY_QUALITY), _encode(thumb, THUMB_QUALITY)
+
+
+def backfill(batch_size=50, force=False, log=print):
+    from utils import run_query, execute_update
+    from image_cache import invalidate_event_image
+
+    sql = "SELECT event_id FROM Event WHERE evn_image IS NOT NULL"
+    if not force:
+        sql += " AND evn_thumb IS NULL"
+    ids = [row[0] for row in run_query(sql + " ORDER BY event_id")]
+    log(f"{len(ids)} poster(s) to process")
+
+    done = failed = saved = 0
+    for i in range(0, len(ids), batch_size):
+        for event_id in ids[i:i + batch_size]:
+            raw = run_query("SELECT evn_image FROM Event WHERE event_id = ?", (event_id,))[0][0]
+            try:
+                display, thumb = process_poster(bytes(raw))
+            except ValueError as e:
+                failed += 1
+                log(f"  event {event_id}: skipped ({e})")
+                continue
+            if execute_update("UPDATE Event SET evn_image=?, evn_thumb=? WHERE event_id=?", (display, thumb, event_id)):
+                invalidate_event_image(event_id)
+                done += 1
+                saved += len(raw) - len(display)
+        log(f"  {min(i + batch_size, len(ids))}/{len(ids)}")
+    log(f"Processed {done}, failed {failed}, saved {saved / 1024 / 1024:.1f} MB")
+    return done, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event poster image pipeline")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmd = sub.add_parser("backfill", help="Re-encode stored posters and generate missing thumbnails")
+    cmd.add_argument("--batch-size", type=int, default=50)
+    cmd.add_argument("--force", action="store_true", help="Reprocess posters that already have a thumbnail")
+    args = parser.parse_args()
+    if args.command == "backfill":
+        backfill(args.batch_size, args.force)
+
+
+if __name__ == "__main__":
+    main()
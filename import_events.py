@@ -0,0 +1,63 @@
+import streamlit as st
+import pandas as pd
+from bulk_import import read_spreadsheet, validate, find_conflicts, clean_rows, import_rows
+
+st.set_page_config(page_title="Bulk Import", layout="wide")
+st.title("Bulk Import Events")
+st.write("Upload a CSV or Excel file with columns: Name, Location, Start, End (optional: Organizer, Description, Type).")
+st.divider()
+
+if "import_result" in st.session_state:
+    st.success(st.session_state.pop("import_result"))
+
+# A new key after each import clears the uploader, so the imported file isn't re-validated against its own rows.
+upload_key = st.session_state.setdefault("import_upload_key", 0)
+uploaded_file = st.file_uploader("Events file", type=["csv", "xlsx"], key=f"import_upload_{upload_key}")
+if uploaded_file is None:
+    st.stop()
+
+try:
+    raw = read_spreadsheet(uploaded_file, uploaded_file.name)
+except Exception as e:
+    st.error(f"Could not read file: {e}")
+    st.stop()
+
+rows, errors = validate(raw)
+clashes = find_conflicts(rows) if not rows.empty else []
+ready = clean_rows(rows, clashes) if not rows.empty else rows
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Rows in File", len(raw))
+col2.metric("Invalid", len(errors))
+col3.metric("Clashing", len(rows) - len(ready))
+col4.metric("Ready to Import", len(ready))
+
+if errors:
+    st.subheader("Invalid Rows")
+    st.dataframe(pd.DataFrame(errors, columns=["Row", "Problem"]), use_container_width=True, hide_index=True)
+
+if clashes:
+    st.subheader("Schedule Conflicts")
+    st.dataframe(
+        pd.DataFrame(clashes, columns=["Row", "Clashes With Row", "Clashes With Event ID", "Location"]),
+        use_container_width=True, hide_index=True,
+    )
+
+if ready.empty:
+    st.info("Nothing to import.")
+    st.stop()
+
+st.subheader("Preview")
+st.dataframe(
+    ready.drop(columns=["location_id"]).rename(columns=str.title),
+    use_container_width=True, hide_index=True,
+)
+
+status = st.selectbox("Import as", ["Pending", "Approved"], key="import_status")
+if st.button(f"Import {len(ready)} Event(s)", type="primary"):
+    count = import_rows(ready, status)
+    if count:
+        st.session_state.import_result = f"Imported {count} event(s) as {status}."
+        st.session_state.import_upload_key = upload_key + 1
+        st.session_state.pop("import_status", None)
+        st.rerun()
@@ -0,0 +1,115 @@
+import bisect
+import threading
+import time
+
+
+class LocationIntervals:
+    __slots__ = ("items", "starts", "max_duration")
+
+    def __init__(self):
+        self.items = []
+        self.starts = []
+        self.max_duration = None
+
+    def add(self, start, end, event_id):
+        i = bisect.bisect_left(self.items, (start, end, event_id))
+        self.items.insert(i, (start, end, event_id))
+        self.starts.insert(i, start)
+        if self.max_duration is None or end - start > self.max_duration:
+            self.max_duration = end - start
+
+    def remove(self, start, end, event_id):
+        i = bisect.bisect_left(self.items, (start, end, event_id))
+        if i < len(self.items) and self.items[i] == (start, end, event_id):
+            del self.items[i]
+            del self.starts[i]
+
+    def overlapping(self, start, end):
+        # Any booking overlapping [start, end) starts before `end` and no earlier than
+        # start - max_duration, so only that slice of the sorted starts is scanned.
+        if not self.items:
+            return []
+        lo = bisect.bisect_left(self.starts, start - self.max_duration)
+        hi = bisect.bisect_left(self.starts, end)
+        return [item for item in self.items[lo:hi] if item[1] > start]
+
+
+class IntervalIndex:
+    # Non-declined bookings per location, kept in step with the Event table. `loader`
+    # returns (event_id, location_id, start, end) rows and `version` the current Event
+    # data version; the index rebuilds itself whenever it has missed a change.
+
+    def __init__(self, loader, version, max_age=None):
+        self.loader = loader
+        self.version_source = version
+        self.max_age = max_age or None
+        self._locations = {}
+        self._events = {}
+        self._version = None
+        self._built_at = None
+        self._lock = threading.RLock()
+        self.rebuilds = 0
+
+    def _rebuild(self):
+        version = self.version_source()
+        locations, events = {}, {}
+        for event_id, location_id, start, end in self.loader():
+            locations.setdefault(location_id, LocationIntervals()).add(start, end, event_id)
+            events[event_id] = (location_id, start, end)
+        self._locations, self._events = locations, events
+        self._version = version
+        self._built_at = time.monotonic()
+        self.rebuilds += 1
+
+    def _ensure_current(self):
+        if self._version is None or self._version != self.version_source():
+            self._rebuild()
+        elif self.max_age and time.monotonic() - self._built_at > self.max_age:
+            self._rebuild()
+
+    def _discard(self, event_id):
+        booking = self._events.pop(event_id, None)
+        if booking:
+            location_id, start, end = booking
+            self._locations[location_id].remove(start, end, event_id)
+
+    def _insert(self, event_id, location_id, start, end):
+        # A rebuild between a write's commit and its version bump already holds the booking; replace it.
+        self._discard(event_id)
+        self._events[event_id] = (location_id, start, end)
+        self._locations.setdefault(location_id, LocationIntervals()).add(start, end, event_id)
+
+    def apply_change(self, before, after, version):
+        # before/after: event snapshots (dicts) or None; version: Event data version after the write.
+        with self._lock:
+            if self._version is None or version != self._version + 1:
+                self._version = None
+                return
+            if before is not None:
+                self._discard(before["event_id"])
+            if after is not None and after["status"] != "Declined" and after["location_id"] is not None:
+                self._insert(after["event_id"], after["location_id"], after["start"], after["end"])
+            self._version = version
+
+    def conflicts(self, location_id, start, end, exclude_id=None):
+        with self._lock:
+            self._ensure_current()
+            intervals = self._locations.get(location_id)
+            if intervals is None:
+                return []
+            return [event_id for _, _, event_id in intervals.overlapping(start, end) if event_id != exclude_id]
+
+    def bookings(self, location_id):
+        with self._lock:
+            self._ensure_current()
+            intervals = self._locations.get(location_id)
+            return [(start, end, event_id) for start, end, event_id in intervals.items] if intervals else []
+
+    def invalidate(self):
+        with self._lock:
+            self._version = None
+
+    def stats(self):
+        with self._lock:
+            return {"locations": len(self._locations), "bookings": len(self._events),
+                    "version": self._version, "rebuilds": self.rebuilds}
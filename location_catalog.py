@@ -0,0 +1,45 @@
+from cache import VersionedCache
+from request_memo import memoize
+from utils import run_query, setting
+
+# Column order matches the Location List table.
+CATALOG_SQL = """
+    SELECT location_id, loc_name, loc_type, loc_capacity,
+           loc_address, loc_contact_person, loc_phone, loc_status
+    FROM Location
+    ORDER BY location_id
+"""
+
+# Any Location write through utils bumps the version; the ttl picks up edits made by other processes.
+_catalog_cache = VersionedCache(("Location",), ttl=float(setting("location_catalog_ttl", 300)), name="locations")
+
+
+class LocationCatalog:
+    __slots__ = ("rows", "names", "ids", "available_rows", "available")
+
+    def __init__(self, rows):
+        self.rows = [tuple(row) for row in rows]
+        self.names = {row[0]: row[1] for row in self.rows}
+        self.ids = {row[1]: row[0] for row in self.rows}
+        # As the SQL filter loc_status != 'Unavailable' did, a NULL status is not bookable.
+        self.available_rows = [row for row in self.rows if row[7] is not None and row[7] != "Unavailable"]
+        self.available = {row[1]: row[0] for row in self.available_rows}
+
+    def options(self, available_only=False):
+        # {name: id} for dropdowns, in id order.
+        return dict(self.available if available_only else self.ids)
+
+    def sorted_by_name(self):
+        return sorted(self.names.items(), key=lambda item: item[1])
+
+
+def location_catalog():
+    return memoize("locations", (), lambda: _catalog_cache.get_or_compute(
+        "catalog", lambda: LocationCatalog(run_query(CATALOG_SQL))
+    ), ("Location",))
+
+
+def refresh_location_catalog():
+    # Called after a Location write so the next render is already served from memory.
+    _catalog_cache.clear()
+    return location_catalog()
@@ -0,0 +1,70 @@
+import streamlit as st
+import datetime
+import plotly.express as px
+from occupancy import occupancy, WEEKDAYS, OPEN_HOURS
+
+st.set_page_config(page_title="Location Occupancy", layout="wide")
+st.title("Location Occupancy")
+st.write(f"How booked each venue is, by hour. Utilization counts open hours ({OPEN_HOURS[0]:02d}:00–{OPEN_HOURS[1]:02d}:00) only.")
+st.divider()
+
+today = datetime.date.today()
+year_start = datetime.date(today.year if today.month >= 8 else today.year - 1, 8, 1)
+presets = {
+    "Next 30 days": (today, today + datetime.timedelta(days=29)),
+    "Last 30 days": (today - datetime.timedelta(days=29), today),
+    "Academic year": (year_start, datetime.date(year_start.year + 1, 7, 31)),
+    "Custom": None,
+}
+
+c_range, c_dates, c_pending = st.columns([2, 3, 1])
+with c_range:
+    preset = st.selectbox("Range", list(presets))
+with c_dates:
+    if presets[preset] is None:
+        picked = st.date_input("Dates", value=(today, today + datetime.timedelta(days=29)))
+        if len(picked) != 2:
+            st.stop()
+        first_day, last_day = picked
+    else:
+        first_day, last_day = presets[preset]
+        st.date_input("Dates", value=(first_day, last_day), disabled=True)
+with c_pending:
+    st.write("")
+    include_pending = st.toggle("Include pending", value=True)
+
+try:
+    occ = occupancy(first_day, last_day)
+except Exception as e:
+    st.error(f"Database Error: {e}")
+    st.stop()
+
+if not occ.location_ids:
+    st.info("No locations found.")
+    st.stop()
+
+util = occ.utilization(include_pending)
+st.subheader("Utilization")
+st.dataframe(
+    util, use_container_width=True, hide_index=True,
+    column_config={"Utilization %": st.column_config.ProgressColumn("Utilization %", min_value=0, max_value=100, format="%.1f%%")}
+)
+
+st.subheader("Weekday × Hour")
+names = {name: loc_id for loc_id, name in zip(occ.location_ids, occ.location_names)}
+choice = st.selectbox("Location", ["All locations"] + occ.location_names)
+location_id = names.get(choice)
+
+heat = occ.heatmap(location_id, include_pending)
+fig = px.imshow(
+    heat, x=[f"{h:02d}:00" for h in range(24)], y=WEEKDAYS, aspect="auto",
+    color_continuous_scale="Blues", zmin=0, zmax=max(float(heat.max()), 1.0),
+    labels=dict(x="Hour", y="Weekday", color="% booked")
+)
+fig.update_layout(margin=dict(l=20, r=20, t=30, b=20))
+st.plotly_chart(fig, use_container_width=True)
+
+profile = occ.hourly_profile(location_id, include_pending)
+top = profile.argsort()[::-1][:3]
+st.caption("Peak hours: " + ", ".join(f"{h:02d}:00 ({profile[h]:.0f}% of days)" for h in top if profile[h] > 0) if profile.max() > 0
+           else "No bookings in this range.")
@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
 import pyodbc
-from utils import run_query, execute_update
+from utils import execute_update
+from location_catalog import location_catalog, refresh_location_catalog
 
 st.set_page_config(page_title="Location list", layout="wide")
 st.title("Location List")
@@ -19,12 +20,7 @@ with col_add:
 st.divider()
 
 try:
-    fetch_sql = """
-        SELECT location_id,loc_name,loc_type,loc_capacity,
-        loc_address,loc_contact_person,loc_phone,loc_status
-        FROM Location
-    """
-    rows = run_query(fetch_sql)
+    rows = location_catalog().rows
     columns = ["ID","Name","Type","Capacity","Address","Contact Person","Phone","Status"]
     df = pd.DataFrame.from_records(rows,columns=columns)
     
@@ -74,6 +70,7 @@ try:
                     params = (new_name, final_type, new_cap, new_status, new_person, new_phone, new_addr, current_id)
                     
                     if execute_update(update_sql,params):
+                        refresh_location_catalog()
                         st.success("Edited!")
                         st.rerun()
                 
@@ -82,6 +79,7 @@ try:
             if st.button("Confirm", type="primary"):
                 delete_sql = "DELETE FROM Location WHERE location_id = ?"
                 if execute_update(delete_sql,(current_id,)):
+                    refresh_location_catalog()
                     st.success(f"Location: '{current_name}' Deletion successful")
                     st.rerun()
                     
@@ -3,6 +3,10 @@ import calendar
 import datetime
 from utils import run_query
 from utils import fetch_and_process_events_for_calendar, EVENT_COLORS
+from event_model import EventTable
+from calendar_render import render_month, build_month_html
+from utils import calendar_window, fetch_event_counts, fetch_recent_past_events, UPCOMING_LOOKAHEAD_DAYS
+from request_memo import begin_request, end_request
 
 @st.dialog("Event Details")
 def show_event_details(event_name, location, start_dt, end_dt, description):
@@ -92,16 +96,21 @@ def render_sidebar_content():
     cal_year = st.session_state.cal_year
     cal_month = st.session_state.cal_month
     
+    today = datetime.date.today()
+    window = calendar_window(cal_year, cal_month, today=today, lookahead_days=UPCOMING_LOOKAHEAD_DAYS)
     try:
-        day_slots, loc_color_map, events_raw = fetch_and_process_events_for_calendar()
+        _, loc_color_map, events_raw = fetch_and_process_events_for_calendar(*window)
+        if not (window[0] <= today < window[1]):
+            _, _, events_raw = fetch_and_process_events_for_calendar(
+                today, today + datetime.timedelta(days=UPCOMING_LOOKAHEAD_DAYS + 1)
+            )
+        upcoming_count, past_count = fetch_event_counts(today)
+        past_events = fetch_recent_past_events(today, limit=3)
     except Exception:
-        day_slots = {}; events_raw = []; loc_color_map = {}
+        events_raw = EventTable([]); loc_color_map = {}
+        upcoming_count = past_count = 0; past_events = EventTable([])
         
-    today = datetime.date.today()
-    events_raw.sort(key=lambda x: x['start'])
-    upcoming_events = [e for e in events_raw if e['end'] >= today]
-    past_events = [e for e in events_raw if e['end'] < today]
-    past_events.sort(key=lambda x: x['start'], reverse=True)
+    upcoming_events = events_raw.upcoming(today)
 
     st.markdown("### 🗓️ Quick View Calendar")
     col_title = st.columns([1])[0] 
@@ -110,54 +119,39 @@ def render_sidebar_content():
 
     st.markdown("<style>.sidebar-cal-table { width: 100%; table-layout: fixed; border-collapse: collapse; margin: 0px;} .sidebar-cal-th { text-align: center; padding: 2px; font-size: 10px; } .sidebar-cal-empty { background-color: #0e1117; border: none; }</style>", unsafe_allow_html=True)
 
-    cal = calendar.monthcalendar(cal_year, cal_month)
-    html = "<table class='sidebar-cal-table'><thead><tr>"
-    for day in ["M", "T", "W", "T", "F", "S", "S"]: html += f"<th class='sidebar-cal-th'>{day}</th>"
-    html += "</tr></thead><tbody>"
-
-    for week in cal:
-        html += "<tr>"
-        for day in week:
-            if day == 0: html += "<td class='sidebar-cal-td sidebar-cal-empty'></td>"
-            else:
-                current_date = datetime.date(cal_year, cal_month, day)
-                html += f"<td class='sidebar-cal-td'><span class='sidebar-cal-day'>{day}</span>"
-                if current_date in day_slots:
-                    for i in range(2):
-                        if i in day_slots[current_date]:
-                            evt = day_slots[current_date][i]
-                            html += f"<div class='sidebar-cal-event {evt['type']}' style='background-color: {evt['color']};' title='{evt['tooltip']}'></div>"
-                        else: html += "<div class='sidebar-cal-spacer'></div>"
-                html += "</td>"
-        html += "</tr>"
-    html += "</tbody></table>"
+    try:
+        html = render_month(cal_year, cal_month, "compact", window=window)
+    except Exception:
+        html = build_month_html(cal_year, cal_month, "compact", {})
     st.markdown(html, unsafe_allow_html=True)
     st.caption("Each colored line represents an approved event.")
     
     st.markdown("---") 
     st.markdown("### ✨ Quick View Events")
     
-    st.markdown(f"**Upcoming Events ({len(upcoming_events)})**")
+    st.markdown(f"**Upcoming Events ({upcoming_count})**")
     with st.container(border=True):
         if upcoming_events:
             for event in upcoming_events[:3]: 
-                event_key = f"upcoming_{event['name']}_{event['start']}"
-                st.markdown(f"**{event['name']}**")
-                st.caption(f"📅 {event['start'].strftime('%b %d')} @ {event['location']}")
+                event_key = f"upcoming_{event.name}_{event.start}"
+                st.markdown(f"**{event.name}**")
+                st.caption(f"📅 {event.start.strftime('%b %d')} @ {event.location}")
                 if st.button("Details", key=event_key, use_container_width=True):
-                    show_event_details(event['name'], event['location'], event['dt_start'], event['dt_end'], event['desc'])
-            if len(upcoming_events) > 3: st.caption(f"... and {len(upcoming_events) - 3} more.")
+                    show_event_details(event.name, event.location, event.dt_start, event.dt_end, event.desc)
+            shown = min(3, len(upcoming_events))
+            if upcoming_count > shown: st.caption(f"... and {upcoming_count - shown} more.")
+        elif upcoming_count: st.info(f"No events in the next {UPCOMING_LOOKAHEAD_DAYS} days.")
         else: st.info("No upcoming events scheduled.")
             
-    st.markdown(f"**Past Events ({len(past_events)})**")
+    st.markdown(f"**Past Events ({past_count})**")
     with st.container(border=True):
         if past_events:
             for event in past_events[:3]:
-                event_key = f"past_{event['name']}_{event['start']}"
-                st.markdown(f"**{event['name']}**")
-                st.caption(f"✅ Ended {event['end'].strftime('%b %d')} @ {event['location']}")
+                event_key = f"past_{event.name}_{event.start}"
+                st.markdown(f"**{event.name}**")
+                st.caption(f"✅ Ended {event.end.strftime('%b %d')} @ {event.location}")
                 if st.button("Details", key=event_key, use_container_width=True):
-                    show_event_details(event['name'], event['location'], event['dt_start'], event['dt_end'], event['desc'])
+                    show_event_details(event.name, event.location, event.dt_start, event.dt_end, event.desc)
         else: st.info("No past events found.")
 
 
@@ -235,9 +229,12 @@ elif st.session_state.role == "student_check":
 elif st.session_state.role == "admin":
     pages["Management"] = [
         st.Page("summary.py", title="📈 Analytics Summary"),
+        st.Page("performance.py", title="⏱️ Performance"),
         st.Page("event_manage.py", title="📊 Event Management"),
         st.Page("location_list.py", title="📍 Locations"),
+        st.Page("location_heatmap.py", title="🔥 Location Occupancy"),
         st.Page("add_location.py", title="➕ Add Location"),
+        st.Page("import_events.py", title="📥 Bulk Import"),
     ]
 
 pg = st.navigation(pages)
@@ -250,4 +247,9 @@ with st.sidebar:
         if st.button("🚪 Logout / Main Menu", use_container_width=True):
             logout()
 
-pg.run()
\ No newline at end of file
+# Loads shared by the sidebar and the page are fetched once per rerun.
+request = begin_request()
+try:
+    pg.run()
+finally:
+    end_request(request)
@@ -0,0 +1,134 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from cache import VersionedCache
+from location_catalog import location_catalog
+from utils import iter_query, setting
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+OPEN_HOURS = (7, 22)
+
+BOOKINGS_SQL = """
+    SELECT location_id, evn_start_date, evn_end_date, evn_status FROM Event
+    WHERE evn_status IN ('Approved', 'Pending') AND location_id IS NOT NULL
+      AND evn_start_date < ? AND evn_end_date > ?
+"""
+
+_occupancy_cache = VersionedCache(
+    ("Event", "Location"),
+    max_bytes=int(float(setting("occupancy_cache_max_mb", 32)) * 1024 * 1024),
+    name="occupancy",
+)
+
+
+def _hour_bitmap(loc_idx, start_h, end_h, n_locations, n_hours):
+    # Difference array: +1 at each booking's first hour, -1 after its last, then a
+    # cumulative sum along the hour axis marks every hour covered by at least one booking.
+    diff = np.zeros((n_locations, n_hours + 1), dtype=np.int32)
+    np.add.at(diff, (loc_idx, start_h), 1)
+    np.add.at(diff, (loc_idx, end_h), -1)
+    return np.cumsum(diff[:, :-1], axis=1) > 0
+
+
+class Occupancy:
+    # Per-hour occupancy of every location over [first_day, last_day]: `approved` and
+    # `pending` are boolean arrays of shape (locations, days * 24).
+    __slots__ = ("location_ids", "location_names", "first_day", "days", "approved", "pending")
+
+    def __init__(self, location_ids, location_names, first_day, days, approved, pending):
+        self.location_ids = location_ids
+        self.location_names = location_names
+        self.first_day = first_day
+        self.days = days
+        self.approved = approved
+        self.pending = pending
+
+    def booked(self, include_pending=True):
+        return self.approved | self.pending if include_pending else self.approved
+
+    def _by_day(self, include_pending=True):
+        return self.booked(include_pending).reshape(len(self.location_ids), self.days, 24)
+
+    def _open_mask(self):
+        mask = np.zeros(24, dtype=bool)
+        mask[OPEN_HOURS[0]:OPEN_HOURS[1]] = True
+        return mask
+
+    def utilization(self, include_pending=True):
+        by_day = self._by_day(include_pending)
+        open_mask = self._open_mask()
+        booked_open = by_day[:, :, open_mask].sum(axis=(1, 2))
+        approved = self._by_day(False)[:, :, open_mask].sum(axis=(1, 2))
+        capacity = self.days * int(open_mask.sum())
+        return pd.DataFrame({
+            "Location": self.location_names,
+            "Booked Hours": booked_open,
+            "Approved Hours": approved,
+            "Utilization %": np.round(booked_open / max(capacity, 1) * 100, 1),
+            "Peak Hour": [f"{h:02d}:00" if n else "—" for h, n in zip(*self._peaks(by_day))],
+        }).sort_values("Utilization %", ascending=False, ignore_index=True)
+
+    def location_utilization(self, location_id, include_pending=True):
+        if location_id not in self.location_ids:
+            return None
+        by_day = self._select(self._by_day(include_pending), location_id)[:, :, self._open_mask()]
+        return round(float(by_day.mean()) * 100, 1)
+
+    def _peaks(self, by_day):
+        per_hour = by_day.sum(axis=1)
+        return per_hour.argmax(axis=1), per_hour.max(axis=1)
+
+    def hourly_profile(self, location_id=None, include_pending=True):
+        # Share of days on which each hour of the day is booked.
+        by_day = self._select(self._by_day(include_pending), location_id)
+        return by_day.mean(axis=1).mean(axis=0) * 100
+
+    def heatmap(self, location_id=None, include_pending=True):
+        # Weekday x hour matrix: percentage of that weekday's occurrences in range booked at that hour.
+        by_day = self._select(self._by_day(include_pending), location_id).mean(axis=0)
+        weekday = (np.arange(self.days) + self.first_day.weekday()) % 7
+        totals = np.zeros((7, 24))
+        np.add.at(totals, weekday, by_day)
+        counts = np.bincount(weekday, minlength=7)[:, None]
+        return np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0) * 100
+
+    def _select(self, by_day, location_id):
+        if location_id is None:
+            return by_day
+        return by_day[[self.location_ids.index(location_id)]]
+
+
+def _build(first_day, last_day):
+    days = (last_day - first_day).days + 1
+    range_start = datetime.datetime.combine(first_day, datetime.time())
+    range_end = range_start + datetime.timedelta(days=days)
+    n_hours = days * 24
+
+    locations = location_catalog().sorted_by_name()
+    location_ids = [row[0] for row in locations]
+    index = {loc_id: i for i, loc_id in enumerate(location_ids)}
+
+    rows = [row for row in iter_query(BOOKINGS_SQL, (range_end, range_start), batch_size=5000) if row[0] in index]
+    if rows:
+        loc, start, end, status = zip(*rows)
+        loc_idx = np.fromiter((index[l] for l in loc), dtype=np.intp, count=len(rows))
+        origin = np.datetime64(range_start, "s")
+        start_s = (np.array(start, dtype="datetime64[s]") - origin).astype(np.int64)
+        end_s = (np.array(end, dtype="datetime64[s]") - origin).astype(np.int64)
+        start_h = np.clip(start_s // 3600, 0, n_hours)
+        end_h = np.clip(-(-end_s // 3600), 0, n_hours)
+        approved = np.array(status) == "Approved"
+    else:
+        loc_idx = start_h = end_h = np.zeros(0, dtype=np.intp)
+        approved = np.zeros(0, dtype=bool)
+
+    def bitmap(mask):
+        return _hour_bitmap(loc_idx[mask], start_h[mask], end_h[mask], len(location_ids), n_hours)
+
+    return Occupancy(location_ids, [row[1] for row in locations], first_day, days, bitmap(approved), bitmap(~approved))
+
+
+def occupancy(first_day, last_day):
+    return _occupancy_cache.get_or_compute((first_day, last_day), lambda: _build(first_day, last_day))
@@ -0,0 +1,74 @@
+import streamlit as st
+import pandas as pd
+from cache import cache_stats
+from utils import query_stats, init_pool, booking_index, status_counters
+from image_cache import poster_cache_stats
+from request_memo import request_stats
+
+st.set_page_config(page_title="Performance", layout="wide")
+st.title("Performance")
+st.write(f"Query timings for this server process since {query_stats.since:%b %d, %Y %I:%M %p}.")
+st.divider()
+
+queries = pd.DataFrame(query_stats.summary())
+slow = pd.DataFrame(query_stats.slow_queries())
+# The timings and caches are in-process, so the page stays useful when the database is unreachable.
+try:
+    pool = init_pool().metrics()
+except Exception as e:
+    st.error(f"❌ Database Error: **{e}**")
+    pool = {}
+caches = {**cache_stats(), "posters": poster_cache_stats()}
+indexes = {"booking_index": booking_index.stats(), "status_counters": status_counters.stats()}
+memo = request_stats()
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Queries", int(queries["calls"].sum()) if not queries.empty else 0)
+c2.metric("Query Time", f"{queries['total_ms'].sum() / 1000:.2f} s" if not queries.empty else "0 s")
+c3.metric(f"Slow (≥ {query_stats.slow_ms:g} ms)", len(slow))
+c4.metric("Pool In Use", f"{pool['in_use']} / {pool['max_size']}" if pool else "-")
+
+c_export, c_reset = st.columns([1, 1])
+c_export.download_button(
+    "📥 Export JSON", data=lambda: query_stats.to_json(pool=pool, caches=caches, indexes=indexes, request_memo=memo),
+    file_name="performance_report.json", mime="application/json", use_container_width=True
+)
+if c_reset.button("Reset Query Stats", use_container_width=True):
+    query_stats.reset(); st.rerun()
+
+st.subheader("Queries by Total Time")
+if queries.empty:
+    st.info("No queries recorded yet.")
+else:
+    queries["MB"] = (queries.pop("bytes") / 1024 / 1024).round(3)
+    st.dataframe(
+        queries, use_container_width=True, hide_index=True,
+        column_config={
+            "fingerprint": st.column_config.TextColumn("Query", width="large"),
+            "blob_calls": st.column_config.NumberColumn("Blob Calls", help="Calls that moved binary (poster) data"),
+        }
+    )
+
+st.subheader("Slow Query Log")
+if slow.empty:
+    st.info("No slow queries.")
+else:
+    st.dataframe(slow, use_container_width=True, hide_index=True,
+                 column_config={"fingerprint": st.column_config.TextColumn("Query", width="large")})
+
+c_pool, c_cache = st.columns(2)
+with c_pool:
+    st.subheader("Connection Pool")
+    st.dataframe(pd.DataFrame(pool.items(), columns=["Metric", "Value"]).astype({"Value": str}),
+                 use_container_width=True, hide_index=True)
+with c_cache:
+    st.subheader("Caches")
+    st.dataframe(pd.DataFrame.from_dict(caches, orient="index").rename_axis("Cache").reset_index(),
+                 use_container_width=True, hide_index=True)
+    st.subheader("In-Memory Indexes")
+    st.json(indexes, expanded=False)
+    st.subheader("Per-Rerun Memo")
+    st.caption(f"{memo['requests']} reruns: {memo['hits']} repeated loads served from the rerun, {memo['misses']} loaded.")
+    if memo["loads"]:
+        st.dataframe(pd.DataFrame.from_dict(memo["loads"], orient="index").rename_axis("Load").reset_index(),
+                     use_container_width=True, hide_index=True)
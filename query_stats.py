@@ -0,0 +1,125 @@
+import bisect
+import datetime
+import functools
+import json
+import re
+import threading
+from collections import deque
+
+# Histogram bucket upper bounds in milliseconds, ~25% apart from 0.05 ms to ~2 min.
+BUCKETS_MS = [0.05 * 1.25 ** i for i in range(67)]
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRINGS = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(sql):
+    # Normalized SQL: literals become ?, IN lists collapse, whitespace is squeezed.
+    sql = _COMMENTS.sub(" ", sql)
+    sql = _STRINGS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _IN_LISTS.sub("(...)", sql)
+    return _SPACES.sub(" ", sql).strip().rstrip(";")
+
+
+def row_bytes(rows):
+    # Approximate payload size of fetched rows; returns (bytes, any binary column seen).
+    total, blobs = 0, False
+    for row in rows:
+        for value in row:
+            if isinstance(value, (bytes, bytearray, memoryview)):
+                total += len(value)
+                blobs = True
+            elif isinstance(value, str):
+                total += len(value)
+            elif value is not None:
+                total += 8
+    return total, blobs
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "total_ms", "max_ms", "rows", "bytes", "blob_calls", "errors")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.blob_calls = 0
+        self.errors = 0
+
+    def add(self, ms, rows, nbytes, blobs, error):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.rows += rows or 0
+        self.bytes += nbytes or 0
+        self.blob_calls += bool(blobs)
+        self.errors += bool(error)
+
+    def percentile(self, p):
+        # Upper bound of the bucket holding the p-th percentile, capped at the observed max.
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms, self.max_ms)
+        return self.max_ms
+
+
+class QueryStats:
+    def __init__(self, slow_ms=200, slow_log_size=200):
+        self.slow_ms = slow_ms
+        self._histograms = {}
+        self._slow = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+        self.since = datetime.datetime.now()
+
+    def record(self, sql, seconds, rows=None, nbytes=None, blobs=False, error=False):
+        key = fingerprint(sql)
+        ms = seconds * 1000
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _Histogram()
+            hist.add(ms, rows, nbytes, blobs, error)
+            if ms >= self.slow_ms:
+                self._slow.append({"at": datetime.datetime.now().isoformat(timespec="seconds"), "ms": round(ms, 2),
+                                   "fingerprint": key, "rows": rows, "bytes": nbytes, "blobs": bool(blobs),
+                                   "error": bool(error)})
+
+    def summary(self):
+        with self._lock:
+            items = list(self._histograms.items())
+            result = [{
+                "fingerprint": key, "calls": h.count, "total_ms": round(h.total_ms, 2),
+                "avg_ms": round(h.total_ms / h.count, 3), "p50_ms": round(h.percentile(50), 3),
+                "p95_ms": round(h.percentile(95), 3), "p99_ms": round(h.percentile(99), 3),
+                "max_ms": round(h.max_ms, 3), "rows": h.rows, "bytes": h.bytes,
+                "blob_calls": h.blob_calls, "errors": h.errors,
+            } for key, h in items]
+        return sorted(result, key=lambda r: r["total_ms"], reverse=True)
+
+    def slow_queries(self):
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._slow.clear()
+            self.since = datetime.datetime.now()
+
+    def to_json(self, **extra):
+        report = {"since": self.since.isoformat(timespec="seconds"), "slow_query_ms": self.slow_ms,
+                  "queries": self.summary(), "slow_queries": self.slow_queries()}
+        report.update(extra)
+        return json.dumps(report, indent=2, default=str)
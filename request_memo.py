@@ -0,0 +1,67 @@
+import contextvars
+import threading
+from collections import Counter
+
+from cache import data_version
+
+_scope = contextvars.ContextVar("request_scope", default=None)
+_totals_lock = threading.Lock()
+_totals = {"requests": 0, "hits": Counter(), "misses": Counter()}
+_last = {}
+
+
+class RequestScope:
+    # Values loaded during one script rerun. Nothing outlives the rerun, so sessions never see each other's data.
+
+    def __init__(self):
+        self.values = {}
+        self.hits = Counter()
+        self.misses = Counter()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self.values:
+                self.hits[key[0]] += 1
+                return self.values[key]
+        value = compute()
+        with self._lock:
+            self.misses[key[0]] += 1
+            return self.values.setdefault(key, value)
+
+
+def begin_request():
+    return _scope.set(RequestScope())
+
+
+def end_request(token):
+    scope = _scope.get()
+    _scope.reset(token)
+    if scope is None:
+        return
+    with _totals_lock:
+        _totals["requests"] += 1
+        _totals["hits"].update(scope.hits)
+        _totals["misses"].update(scope.misses)
+        _last.clear()
+        _last.update(hits=sum(scope.hits.values()), misses=sum(scope.misses.values()))
+
+
+def memoize(name, args, compute, tables=()):
+    # Outside a request (scripts, benchmarks, worker threads without a copied context) this just computes.
+    # The key carries the data versions of `tables`, so a write earlier in the same rerun forces a reload.
+    scope = _scope.get()
+    if scope is None:
+        return compute()
+    return scope.get_or_compute((name, args, data_version(*tables)), compute)
+
+
+def request_stats():
+    with _totals_lock:
+        names = sorted(set(_totals["hits"]) | set(_totals["misses"]))
+        return {
+            "requests": _totals["requests"],
+            "hits": sum(_totals["hits"].values()), "misses": sum(_totals["misses"].values()),
+            "last_request": dict(_last),
+            "loads": {name: {"hits": _totals["hits"][name], "misses": _totals["misses"][name]} for name in names},
+        }
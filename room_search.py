@@ -0,0 +1,73 @@
+import bisect
+import re
+
+import pandas as pd
+
+from cache import VersionedCache
+from location_catalog import location_catalog
+from utils import run_query
+
+_room_cache = VersionedCache(("Location",), name="rooms")
+
+
+def parse_capacity(text):
+    # Free-text capacity ("500", "1,000 pax", "150-200 seats") -> largest number mentioned, or None.
+    if text is None:
+        return None
+    numbers = [int(n.replace(",", "")) for n in re.findall(r"\d[\d,]*", str(text))]
+    return max(numbers) if numbers else None
+
+
+class RoomIndex:
+    # Bookable locations grouped by type, each group sorted by parsed capacity
+    # (unknown capacities sort first as -1 and only match searches without a minimum).
+    __slots__ = ("by_type", "capacities", "rooms")
+
+    def __init__(self, rows):
+        self.rooms = {}
+        groups = {}
+        for location_id, name, loc_type, capacity in rows:
+            seats = parse_capacity(capacity)
+            self.rooms[location_id] = (name, loc_type or "", seats)
+            groups.setdefault(loc_type or "", []).append((seats if seats is not None else -1, location_id))
+        self.by_type = {t: sorted(items) for t, items in groups.items()}
+        self.capacities = {t: [c for c, _ in items] for t, items in self.by_type.items()}
+
+    @property
+    def types(self):
+        return sorted(t for t in self.by_type if t)
+
+    def candidates(self, loc_type=None, min_capacity=None):
+        types = [loc_type] if loc_type else list(self.by_type)
+        found = []
+        for t in types:
+            items = self.by_type.get(t, [])
+            lo = bisect.bisect_left(self.capacities[t], min_capacity) if min_capacity else 0
+            found.extend(location_id for _, location_id in items[lo:])
+        return found
+
+
+def room_index():
+    return _room_cache.get_or_compute("rooms", lambda: RoomIndex(row[:4] for row in location_catalog().available_rows))
+
+
+def search_rooms(start_dt, end_dt, loc_type=None, min_capacity=None):
+    # Free venues for [start_dt, end_dt), best fit first: the smallest room that still
+    # seats `min_capacity`, then by name. One query fetches the bookings of all candidates.
+    index = room_index()
+    candidates = index.candidates(loc_type, min_capacity)
+    columns = ["ID", "Location", "Type", "Capacity"]
+    if not candidates:
+        return pd.DataFrame(columns=columns)
+
+    placeholders = ",".join("?" * len(candidates))
+    busy_sql = f"""
+        SELECT DISTINCT location_id FROM Event
+        WHERE location_id IN ({placeholders}) AND evn_status != 'Declined'
+          AND evn_start_date < ? AND evn_end_date > ?
+    """
+    busy = {row[0] for row in run_query(busy_sql, [*candidates, end_dt, start_dt])}
+
+    free = [(location_id, *index.rooms[location_id]) for location_id in candidates if location_id not in busy]
+    free.sort(key=lambda r: (r[3] is None, r[3] if r[3] is not None else 0, r[1]))
+    return pd.DataFrame(free, columns=columns).astype({"Capacity": "Int64"})
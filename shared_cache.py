@@ -0,0 +1,157 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+_MISSING = object()
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, tag TEXT, version TEXT, value BLOB, stored_at REAL);
+    CREATE INDEX IF NOT EXISTS entries_tag ON entries (tag, version);
+    CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT, expires REAL);
+    CREATE TABLE IF NOT EXISTS versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL);
+"""
+
+
+class SharedCache:
+    # A SQLite file shared by every Streamlit process on the host. It holds the per-table data
+    # versions (so a write in one process invalidates the others) and pickled results keyed by
+    # those versions. A lease row per key lets one process compute a missing result while the
+    # rest wait for it. Only point it at a local, trusted path: entries are unpickled on read.
+
+    def __init__(self, path, lease_seconds=30.0, wait_seconds=10.0, version_poll_seconds=1.0):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self.version_poll_seconds = version_poll_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._versions_read_at = None
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.timeouts = 0
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _read_versions(self):
+        self._versions = dict(self._conn().execute("SELECT name, version FROM versions"))
+        self._versions_read_at = time.monotonic()
+
+    def versions(self, *tables):
+        # Other processes' bumps show up within version_poll_seconds; this process's own bumps immediately.
+        with self._lock:
+            if self._versions_read_at is None or time.monotonic() - self._versions_read_at > self.version_poll_seconds:
+                self._read_versions()
+            return tuple(self._versions.get(t.lower(), 0) for t in tables)
+
+    def bump(self, *tables):
+        conn = self._conn()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for t in tables:
+                    conn.execute("INSERT OR IGNORE INTO versions (name, version) VALUES (?, 0)", (t.lower(),))
+                    conn.execute("UPDATE versions SET version = version + 1 WHERE name = ?", (t.lower(),))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._read_versions()
+
+    def _read(self, key, version):
+        row = self._conn().execute("SELECT value FROM entries WHERE key = ? AND version = ?", (key, version)).fetchone()
+        return pickle.loads(row[0]) if row else _MISSING
+
+    def _write(self, key, tag, version, value):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Everything under a tag shares its tables, so other versions of the tag are stale too.
+            conn.execute("DELETE FROM entries WHERE tag = ? AND version != ?", (tag, version))
+            conn.execute("INSERT OR REPLACE INTO entries (key, tag, version, value, stored_at) VALUES (?, ?, ?, ?, ?)",
+                         (key, tag, version, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time()))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _owner(self):
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def _acquire(self, key):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM leases WHERE key = ? AND expires < ?", (key, now))
+            taken = conn.execute("INSERT OR IGNORE INTO leases (key, owner, expires) VALUES (?, ?, ?)",
+                                 (key, self._owner(), now + self.lease_seconds)).rowcount == 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return taken
+
+    def _release(self, key):
+        self._conn().execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._owner()))
+
+    def get_or_compute(self, tag, key, version, compute):
+        key, version = repr((tag, key)), repr(version)
+        deadline = time.monotonic() + self.wait_seconds
+        waited = False
+        while True:
+            value = self._read(key, version)
+            if value is not _MISSING:
+                with self._lock:
+                    self.hits += 1
+                return value
+            if self._acquire(key):
+                try:
+                    value = self._read(key, version)
+                    if value is not _MISSING:
+                        with self._lock:
+                            self.hits += 1
+                        return value
+                    with self._lock:
+                        self.misses += 1
+                    value = compute()
+                    self._write(key, tag, version, value)
+                    return value
+                finally:
+                    self._release(key)
+            if time.monotonic() > deadline:
+                # The lease holder is slow or gone; compute locally rather than stall the page.
+                with self._lock:
+                    self.timeouts += 1
+                return compute()
+            if not waited:
+                waited = True
+                with self._lock:
+                    self.waits += 1
+            time.sleep(0.05)
+
+    def clear(self):
+        self._conn().execute("DELETE FROM entries")
+
+    def stats(self):
+        entries, size = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM entries").fetchone()
+        with self._lock:
+            return {"entries": entries, "bytes": size, "hits": self.hits, "misses": self.misses,
+                    "waits": self.waits, "timeouts": self.timeouts}
+
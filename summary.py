@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils import run_query 
+from utils import submit_queries, status_counters
+from analytics import compute_analytics
 
 st.markdown(
     """
@@ -155,6 +156,23 @@ with st.sidebar:
     st.subheader("Database Status")
     st.success("✅ Connection: Active")
 
+fetch_details_sql = """
+    SELECT TOP 20
+        evn_name,
+        FORMAT(evn_start_date, 'yyyy-MM-dd') as Start_Date,
+        FORMAT(evn_end_date, 'yyyy-MM-dd') as End_Date,
+        evn_status
+    FROM Event
+    ORDER BY evn_start_date DESC;
+"""
+
+# The status counters and the log are database reads, so they run on the query executor while the
+# script thread builds the (CPU-bound) trend analytics; the page waits only on the slowest of them.
+results = submit_queries({
+    "counts": status_counters.snapshot,
+    "recent": fetch_details_sql,
+})
+
 st.markdown("## 🗓️ Analytics Overview")
 st.caption("Real-time summary of event requests and approvals.")
 st.markdown("---")
@@ -163,22 +181,11 @@ with st.container():
     st.markdown("### 📈 Status Breakdown")
     
     try:
-        fetch_summary_sql = """
-            SELECT 
-                COUNT(*) as Total_Event,
-                SUM(CASE WHEN evn_start_date BETWEEN GETDATE() AND DATEADD(day, 7, GETDATE()) THEN 1 ELSE 0 END) as Soon_Event,
-                SUM(CASE WHEN evn_status = 'Pending' THEN 1 ELSE 0 END) as Preparing,
-                SUM(CASE WHEN evn_status = 'Approved' THEN 1 ELSE 0 END) as Completed,
-                SUM(CASE WHEN evn_status = 'Declined' THEN 1 ELSE 0 END) as Canceled
-            FROM Event;
-        """
-
-        event_summary = run_query(fetch_summary_sql)
-        columns = ["Total_Event", "Soon_Event", "Preparing", "Completed", "Canceled"]
-
-        if event_summary:
-            df_summary = pd.DataFrame.from_records(event_summary, columns=columns).fillna(0)
-            row = df_summary.iloc[0]
+        counts = results["counts"].result()
+
+        if counts["Total"]:
+            row = {"Total_Event": counts["Total"], "Soon_Event": counts["Soon"], "Preparing": counts["Pending"],
+                   "Completed": counts["Approved"], "Canceled": counts["Declined"]}
 
             cols = st.columns(5, gap="medium")
             
@@ -251,21 +258,73 @@ with st.container():
 
 st.markdown("<hr>", unsafe_allow_html=True)
 
+with st.container():
+    st.markdown("### 📉 Trends")
+
+    try:
+        trends = compute_analytics()
+        chart_layout = dict(
+            margin=dict(l=20, r=20, t=30, b=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white')
+        )
+        status_colors = {'Pending': '#FFA726', 'Approved': '#66BB6A', 'Declined': '#EF5350'}
+
+        col_weekly, col_rate = st.columns(2)
+        with col_weekly:
+            st.markdown("#### Requests per Week")
+            if not trends["weekly"].empty:
+                fig = px.bar(trends["weekly"], x="Week", y="Requests", color="Status",
+                             color_discrete_map=status_colors)
+                fig.update_layout(**chart_layout)
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No requests yet.")
+
+        with col_rate:
+            st.markdown("#### Approval Rate")
+            if not trends["approval"].empty:
+                fig = px.line(trends["approval"], x="Week", y="Approval Rate", markers=True,
+                              hover_data=["Decided"], range_y=[0, 105])
+                fig.update_traces(line_color='#66BB6A')
+                fig.update_layout(yaxis_ticksuffix="%", **chart_layout)
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No approved or declined requests yet.")
+
+        col_lead, col_loc = st.columns(2)
+        with col_lead:
+            st.markdown("#### Lead Time (days from request to start)")
+            if not trends["lead"].empty:
+                fig = px.histogram(trends["lead"], x="Lead Days", color="Status", nbins=30,
+                                   color_discrete_map=status_colors)
+                fig.update_layout(bargap=0.05, **chart_layout)
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("Lead times appear once new requests are submitted.")
+
+        with col_loc:
+            st.markdown("#### Busiest Locations")
+            if not trends["locations"].empty:
+                fig = px.bar(trends["locations"], x="Events", y="Location", orientation="h",
+                             hover_data=["Booked Hours"])
+                fig.update_traces(marker_color='#4da6ff')
+                fig.update_layout(yaxis=dict(autorange="reversed"), **chart_layout)
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No bookings yet.")
+
+    except Exception as e:
+        st.error(f"❌ Database Error: **{e}**")
+
+st.markdown("<hr>", unsafe_allow_html=True)
+
 with st.container():
     st.markdown("### 📑 Recent & Upcoming Log")
     
     try:
-        fetch_details_sql = """
-            SELECT TOP 20
-                evn_name,
-                FORMAT(evn_start_date, 'yyyy-MM-dd') as Start_Date,
-                FORMAT(evn_end_date, 'yyyy-MM-dd') as End_Date,
-                evn_status
-            FROM Event
-            ORDER BY evn_start_date DESC;
-        """
-        
-        event_details = run_query(fetch_details_sql)
+        event_details = results["recent"].result()
         detail_columns = ["Event Name", "Start Date", "End Date", "Status"]
 
         if event_details:
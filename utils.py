@@ -1,58 +1,301 @@
 import streamlit as st
 import pandas as pd
 import datetime
-import pyodbc
+import calendar
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from db import backend_from_config, ConnectionPool
+from cache import VersionedCache, bump_data_version, clear_caches, data_version, written_table, use_shared_store
+from calendar_layout import layout_spans, spans_to_day_slots
+from event_model import EventTable, make_event
+from interval_index import IntervalIndex
+from event_counters import StatusCounters
+from query_stats import QueryStats, row_bytes
+from request_memo import memoize
+from shared_cache import SharedCache
 
 EVENT_COLORS = [
     "#3788d8", "#28a745", "#6f42c1", "#fd7e14", 
     "#e83e8c", "#d9534f", "#008b8b"
 ]
 
+_backend = None
+_pool = None
+_backend_listeners = []
+
+def setting(key, default=None):
+    try:
+        return st.secrets.get(key, default)
+    except Exception:
+        return default
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = backend_from_config(st.secrets)
+    return _backend
+
+def on_backend_change(listener):
+    # For caches outside utils (e.g. posters) that hold data read from the previous backend.
+    _backend_listeners.append(listener)
+    return listener
+
+def set_backend(backend):
+    global _backend, _pool
+    _backend = backend
+    old_pool, _pool = _pool, None
+    init_pool.clear()
+    if old_pool is not None:
+        old_pool.close()
+    clear_caches()
+    booking_index.invalidate()
+    status_counters.invalidate()
+    for listener in _backend_listeners:
+        listener()
+
 @st.cache_resource
-def init_connection():
-    return pyodbc.connect(
-        "DRIVER={ODBC Driver 17 for SQL Server};SERVER="
-        + st.secrets["server"]
-        + ";DATABASE="
-        + st.secrets["database"]
-        + ";UID="
-        + st.secrets["username"]
-        + ";PWD="
-        + st.secrets["password"]
+def init_pool():
+    global _pool
+    _pool = ConnectionPool(
+        get_backend(),
+        min_size=int(setting("pool_min_size", 1)),
+        max_size=int(setting("pool_max_size", 10)),
+        timeout=float(setting("pool_timeout", 30)),
+        health_check=bool(setting("pool_health_check", True)),
     )
+    return _pool
+
+query_stats = QueryStats(slow_ms=float(setting("slow_query_ms", 200)))
+
+if setting("shared_cache_path"):
+    use_shared_store(SharedCache(
+        setting("shared_cache_path"),
+        lease_seconds=float(setting("shared_cache_lease_seconds", 30)),
+        wait_seconds=float(setting("shared_cache_wait_seconds", 10)),
+        version_poll_seconds=float(setting("shared_version_poll_seconds", 1)),
+    ))
 
 def run_query(query, params=None):
-    conn = init_connection() 
-    with conn.cursor() as cur:
-        if params:
-            cur.execute(query, params)
-        else:
-            cur.execute(query)
-        return cur.fetchall()
+    sql = get_backend().translate(query)
+    with init_pool().connection() as conn, closing(conn.cursor()) as cur:
+        started = time.perf_counter()
+        try:
+            if params:
+                cur.execute(sql, params)
+            else:
+                cur.execute(sql)
+            rows = cur.fetchall()
+        except Exception:
+            query_stats.record(query, time.perf_counter() - started, error=True)
+            raise
+        query_stats.record(query, time.perf_counter() - started, len(rows), *row_bytes(rows))
+        return rows
          
-def execute_update(query, params):
-    conn = init_connection()
+def iter_query(query, params=None, batch_size=1000):
+    sql = get_backend().translate(query)
+    with init_pool().connection() as conn, closing(conn.cursor()) as cur:
+        started = time.perf_counter()
+        elapsed = 0.0
+        count = nbytes = 0
+        blobs = False
+        try:
+            if params:
+                cur.execute(sql, params)
+            else:
+                cur.execute(sql)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                elapsed += time.perf_counter() - started
+                if not rows:
+                    break
+                size, has_blobs = row_bytes(rows)
+                count, nbytes, blobs = count + len(rows), nbytes + size, blobs or has_blobs
+                yield from rows
+                started = time.perf_counter()
+        except GeneratorExit:
+            query_stats.record(query, elapsed, count, nbytes, blobs)
+            raise
+        except Exception:
+            query_stats.record(query, elapsed + time.perf_counter() - started, count, nbytes, blobs, error=True)
+            raise
+        query_stats.record(query, elapsed, count, nbytes, blobs)
+
+@st.cache_resource
+def query_executor():
+    # Never more workers than pooled connections, so parallel reads don't wait on the pool.
+    workers = min(int(setting("parallel_queries", 4)), int(setting("pool_max_size", 10)))
+    return ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="query")
+
+_caller_ctx = contextvars.ContextVar("caller_script_run_ctx", default=None)
+
+def caller_script_run_ctx():
+    # The ScriptRunContext of the script run a query belongs to, also from inside submit_queries workers.
+    return get_script_run_ctx(suppress_warning=True) or _caller_ctx.get()
+
+def _job(job, ctx):
+    if isinstance(job, str):
+        sql, params = job, None
+    elif not callable(job):
+        sql, params = job
+
+    def run():
+        _caller_ctx.set(ctx)
+        return job() if callable(job) else run_query(sql, params)
+    return run
+
+def submit_queries(jobs):
+    # Starts independent I/O-bound reads together; each job is SQL, a (sql, params) pair or a callable
+    # that only reads (no st.* calls). CPU-bound work (pandas) gains nothing here under the GIL and
+    # belongs on the script thread. Returns {name: Future} so callers can handle errors per job,
+    # including a database that can't be reached at all.
     try:
-        with conn.cursor() as cur:
-            cur.execute(query, params)
+        init_pool()
+    except Exception as e:
+        failed = Future()
+        failed.set_exception(e)
+        return {name: failed for name in jobs}
+    executor = query_executor()
+    ctx = caller_script_run_ctx()
+    return {name: executor.submit(contextvars.copy_context().run, _job(job, ctx)) for name, job in jobs.items()}
+
+EVENT_SNAPSHOT_SQL = "SELECT event_id, location_id, evn_start_date, evn_end_date, evn_status FROM Event WHERE event_id = ?"
+
+_event_listeners = []
+_change_lock = threading.Lock()
+
+def on_event_change(listener):
+    _event_listeners.append(listener)
+    return listener
+
+def _event_snapshot(cur, event_id):
+    if event_id is None:
+        return None
+    cur.execute(get_backend().translate(EVENT_SNAPSHOT_SQL), (event_id,))
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return {"event_id": row[0], "location_id": row[1], "start": row[2], "end": row[3], "status": row[4]}
+
+BOOKING_OVERLAP_SQL = """
+    SELECT COUNT(*) FROM Event
+    WHERE location_id = ?
+    AND evn_status != 'Declined'
+    AND (evn_start_date < ? AND evn_end_date > ?)
+"""
+
+class BookingConflict(Exception):
+    pass
+
+def _check_booking(cur, location_id, start, end, exclude_id=None, allowed=0):
+    # Runs inside the write's transaction, after the write: another process's overlapping booking is
+    # either committed (and counted) or still holds its locks, so two overlapping requests can't both commit.
+    sql = BOOKING_OVERLAP_SQL
+    params = [location_id, end, start]
+    if exclude_id is not None:
+        sql += " AND event_id != ?"
+        params.append(exclude_id)
+    cur.execute(get_backend().translate(sql), params)
+    if cur.fetchone()[0] > allowed:
+        raise BookingConflict("This location was just booked for an overlapping time. Please choose another time or location.")
+
+def _check_event_booking(cur, after):
+    if after is not None and after["status"] != "Declined" and after["location_id"] is not None:
+        _check_booking(cur, after["location_id"], after["start"], after["end"], exclude_id=after["event_id"])
+
+def _note_write(query, before=None, after=None):
+    table = written_table(query)
+    if not table:
+        return
+    with _change_lock:
+        bump_data_version(table)
+        if table == "event":
+            # Writes without a before/after snapshot hand listeners no version, telling them to resync.
+            version = data_version("Event")[0] if before is not None or after is not None else None
+            for listener in _event_listeners:
+                listener(before, after, version)
+
+def execute_update(query, params, event_id=None, check_booking=False):
+    started = None
+    try:
+        with init_pool().connection() as conn, closing(conn.cursor()) as cur:
+            before = _event_snapshot(cur, event_id)
+            started = time.perf_counter()
+            cur.execute(get_backend().translate(query), params)
+            query_stats.record(query, time.perf_counter() - started, cur.rowcount, *row_bytes([params]))
+            started = None
+            after = _event_snapshot(cur, event_id)
+            if check_booking:
+                _check_event_booking(cur, after)
             conn.commit()
-            return True
+        _note_write(query, before, after)
+        return True
+    except BookingConflict as e:
+        st.error(f"❌ CONFLICT: {e}")
+        return False
     except Exception as e:
+        if started is not None:
+            query_stats.record(query, time.perf_counter() - started, error=True)
         st.error(f"Database Error: {e}")
         return False
     
-def execute_insert(query, params):
-    conn = init_connection()
+def execute_insert(query, params, check_booking=False):
+    started = None
     try:
-        with conn.cursor() as cur:
-            cur.execute(query, params)
+        with init_pool().connection() as conn, closing(conn.cursor()) as cur:
+            started = time.perf_counter()
+            cur.execute(get_backend().translate(query), params)
             row = cur.fetchone()
+            query_stats.record(query, time.perf_counter() - started, 1, *row_bytes([params]))
+            started = None
+            new_id = row[0] if row else None
+            after = _event_snapshot(cur, new_id) if written_table(query) == "event" else None
+            if check_booking:
+                _check_event_booking(cur, after)
             conn.commit()
-            return row[0] if row else None
+        _note_write(query, None, after)
+        return new_id
+    except BookingConflict as e:
+        st.error(f"❌ CONFLICT: {e}")
+        return None
     except Exception as e:
+        if started is not None:
+            query_stats.record(query, time.perf_counter() - started, error=True)
         st.error(f"Database Error: {e}")
         return None
 
+def execute_many(query, seq_params, bookings=None):
+    # One transaction for the whole batch; pyodbc sends it as a single parameter array.
+    # `bookings` lists (location_id, start, end) of the new rows still to be checked for overlaps before commit.
+    if not seq_params:
+        return 0
+    started = None
+    try:
+        with init_pool().connection() as conn, closing(conn.cursor()) as cur:
+            if hasattr(cur, "fast_executemany"):
+                cur.fast_executemany = True
+            started = time.perf_counter()
+            cur.executemany(get_backend().translate(query), seq_params)
+            query_stats.record(query, time.perf_counter() - started, len(seq_params), *row_bytes(seq_params))
+            started = None
+            for location_id, start, end in bookings or ():
+                # The new row matches its own overlap query unless it is zero-length.
+                _check_booking(cur, location_id, start, end, allowed=1 if start < end else 0)
+            conn.commit()
+        _note_write(query)
+        return len(seq_params)
+    except BookingConflict as e:
+        st.error(f"❌ CONFLICT: {e}")
+        return 0
+    except Exception as e:
+        if started is not None:
+            query_stats.record(query, time.perf_counter() - started, error=True)
+        st.error(f"Database Error: {e}")
+        return 0
+
 def get_time_slots():
     times = []
     for h in range(24):
@@ -61,120 +304,137 @@ def get_time_slots():
             times.append(t.strftime("%I:%M %p")) 
     return times
 
-def check_conflict(location_id, start_dt, end_dt):
-    conn = init_connection()
+def _load_bookings():
     sql = """
-        SELECT COUNT(*) FROM Event 
-        WHERE location_id = ? 
-        AND evn_status != 'Declined'
-        AND (evn_start_date < ? AND evn_end_date > ?)
+        SELECT event_id, location_id, evn_start_date, evn_end_date FROM Event
+        WHERE evn_status != 'Declined' AND location_id IS NOT NULL
     """
-    with conn.cursor() as cur:
-        cur.execute(sql, (location_id, end_dt, start_dt))
-        count = cur.fetchone()[0]
-    return count > 0
+    return iter_query(sql, batch_size=5000)
+
+booking_index = IntervalIndex(
+    _load_bookings, lambda: data_version("Event")[0],
+    max_age=float(setting("booking_index_max_age", 300))
+)
+on_event_change(booking_index.apply_change)
+
+def _load_statuses():
+    return run_query("SELECT event_id, evn_status FROM Event")
+
+def _load_upcoming_starts(start, until):
+    sql = "SELECT evn_start_date, event_id FROM Event WHERE evn_start_date >= ? AND evn_start_date < ?"
+    return run_query(sql, (start, until))
+
+status_counters = StatusCounters(_load_statuses, _load_upcoming_starts, lambda: data_version("Event")[0])
+on_event_change(status_counters.apply_change)
+status_counters.schedule_reconcile(float(setting("status_counters_reconcile_seconds", 300)))
+
+def check_conflict(location_id, start_dt, end_dt, exclude_id=None):
+    return bool(booking_index.conflicts(location_id, start_dt, end_dt, exclude_id))
 
 def check_login(username, password):
-    conn = init_connection()
     sql = "SELECT count(*) FROM AdminUsers WHERE username=? AND password=?"
-    with conn.cursor() as cur:
-        cur.execute(sql, (username, password))
-        return cur.fetchone()[0] > 0
+    return run_query(sql, (username, password))[0][0] > 0
+
+_calendar_cache = VersionedCache(
+    ("Event", "Location"),
+    ttl=float(setting("calendar_cache_ttl", 0)),
+    max_bytes=int(float(setting("calendar_cache_max_mb", 64)) * 1024 * 1024),
+    name="calendar",
+    shared=True,
+)
+
+UPCOMING_LOOKAHEAD_DAYS = 60
+
+def calendar_window(year, month, today=None, lookahead_days=0):
+    weeks = calendar.monthcalendar(year, month)
+    last_day = calendar.monthrange(year, month)[1]
+    start = datetime.date(year, month, 1) - datetime.timedelta(days=weeks[0].index(1))
+    end = datetime.date(year, month, last_day) + datetime.timedelta(days=7 - weeks[-1].index(last_day))
+    if today is not None and lookahead_days and start <= today < end:
+        end = max(end, today + datetime.timedelta(days=lookahead_days + 1))
+    return start, end
 
-def fetch_and_process_events_for_calendar():
+def fetch_and_process_events_for_calendar(window_start=None, window_end=None):
+    return memoize("calendar", (window_start, window_end), lambda: _calendar_cache.get_or_compute(
+        ("calendar", window_start, window_end),
+        lambda: _load_calendar_events(window_start, window_end)
+    ), _calendar_cache.tables)
+
+def fetch_event_counts(today):
+    return memoize("counts", (today,), lambda: _calendar_cache.get_or_compute(
+        ("counts", today), lambda: _load_event_counts(today)
+    ), _calendar_cache.tables)
+
+def fetch_recent_past_events(today, limit=3):
+    return memoize("past", (today, limit), lambda: _calendar_cache.get_or_compute(
+        ("past", today, limit), lambda: _load_recent_past_events(today, limit)
+    ), _calendar_cache.tables)
+
+_CALENDAR_COLUMNS = """
+        SELECT E.evn_name, E.evn_start_date, E.evn_end_date, L.loc_name, E.evn_description, E.location_id
+        FROM Event E
+        LEFT JOIN Location L ON E.location_id = L.location_id
+"""
+
+def _load_event_counts(today):
     sql = """
-        SELECT E.evn_name, E.evn_start_date, E.evn_end_date, L.loc_name, E.evn_description 
+        SELECT 
+            SUM(CASE WHEN evn_end_date >= ? THEN 1 ELSE 0 END),
+            SUM(CASE WHEN evn_end_date < ? THEN 1 ELSE 0 END)
+        FROM Event
+        WHERE evn_status = 'Approved'
+    """
+    rows = run_query(sql, (today, today))
+    upcoming, past = rows[0] if rows else (0, 0)
+    return int(upcoming or 0), int(past or 0)
+
+def _load_recent_past_events(today, limit):
+    sql = f"""
+        SELECT TOP {int(limit)} E.evn_name, E.evn_start_date, E.evn_end_date, L.loc_name, E.evn_description, E.location_id
         FROM Event E
         LEFT JOIN Location L ON E.location_id = L.location_id
-        WHERE E.evn_status = 'Approved'
+        WHERE E.evn_status = 'Approved' AND E.evn_end_date < ?
+        ORDER BY E.evn_start_date DESC
     """
-    rows = run_query(sql)
-    
-    events_raw = []
-    unique_locations = set()
+    return EventTable([evt for evt in map(_event_record, run_query(sql, (today,))) if evt])
+
+def location_color(location_id):
+    if location_id is None:
+        return "#555"
+    return EVENT_COLORS[int(location_id) % len(EVENT_COLORS)]
+
+def _event_record(row):
+    name = row[0]
+    start_val = row[1]
+    end_val = row[2] if row[2] else start_val 
+    loc_name = row[3] if row[3] else "Unknown"
+    desc = row[4] if row[4] else ""
     
-    for row in rows:
-        name = row[0]
-        start_val = row[1]
-        end_val = row[2] if row[2] else start_val 
-        loc_name = row[3] if row[3] else "Unknown"
-        desc = row[4] if row[4] else ""
-        
-        dt_start, start = None, None
-        if isinstance(start_val, datetime.datetime):
-            dt_start = start_val
-            start = start_val.date()
-        elif isinstance(start_val, datetime.date):
-            dt_start = datetime.datetime.combine(start_val, datetime.time(0,0))
-            start = start_val
-        else: continue
-            
-        dt_end, end = None, None
-        if isinstance(end_val, datetime.datetime):
-            dt_end = end_val
-            end = end_val.date()
-        elif isinstance(end_val, datetime.date):
-            dt_end = datetime.datetime.combine(end_val, datetime.time(0,0))
-            end = end_val
-        else:
-            dt_end = dt_start
-            end = start
+    if isinstance(start_val, datetime.datetime):
+        dt_start = start_val
+    elif isinstance(start_val, datetime.date):
+        dt_start = datetime.datetime.combine(start_val, datetime.time(0,0))
+    else: return None
         
-        events_raw.append({
-            "name": name, "start": start, "end": end, "dt_start": dt_start,
-            "dt_end": dt_end, "location": loc_name, "desc": desc,
-            "duration": (end - start).days + 1
-        })
-        unique_locations.add(loc_name)
-        
-    sorted_locs = sorted(list(unique_locations))
-    loc_color_map = {loc: EVENT_COLORS[i % len(EVENT_COLORS)] for i, loc in enumerate(sorted_locs)}
+    if isinstance(end_val, datetime.datetime):
+        dt_end = end_val
+    elif isinstance(end_val, datetime.date):
+        dt_end = datetime.datetime.combine(end_val, datetime.time(0,0))
+    else:
+        dt_end = dt_start
     
-    day_slots = {} 
-    events_raw.sort(key=lambda x: (x['start'], -x['duration']))
+    return make_event(name, dt_start, dt_end, loc_name, desc, location_color(row[5]))
+
+def _load_calendar_events(window_start=None, window_end=None):
+    sql = _CALENDAR_COLUMNS + "        WHERE E.evn_status = 'Approved'\n"
+    params = []
+    if window_start is not None and window_end is not None:
+        sql += "        AND E.evn_start_date < ? AND E.evn_end_date >= ?\n"
+        params = [window_end, window_start]
+    rows = run_query(sql, params)
     
-    for evt in events_raw:
-        start_d = evt['start']
-        duration = evt['duration']
-        
-        slot_index = 0
-        while True:
-            is_slot_free = True
-            for i in range(duration):
-                check_date = start_d + datetime.timedelta(days=i)
-                if check_date not in day_slots:
-                    day_slots[check_date] = {}
-                if slot_index in day_slots[check_date]:
-                    is_slot_free = False
-                    break
-            if is_slot_free:
-                break
-            else:
-                slot_index += 1
-        
-        color = loc_color_map.get(evt['location'], "#555")
-        
-        for i in range(duration):
-            current_d = start_d + datetime.timedelta(days=i)
-            
-            if duration == 1:
-                pos_type = "evt-single"
-                txt = evt['location']
-            elif i == 0:
-                pos_type = "evt-start"
-                txt = evt['location']
-            elif i == (duration - 1):
-                pos_type = "evt-end"
-                txt = "" 
-            else:
-                pos_type = "evt-mid"
-                txt = "&nbsp;"
-                
-            day_slots[current_d][slot_index] = {
-                "text": txt,
-                "tooltip": f"{evt['name']} @ {evt['location']}",
-                "color": color,
-                "type": pos_type
-            }
+    events_raw, lanes = layout_spans(EventTable([evt for evt in map(_event_record, rows) if evt]))
+    loc_color_map = events_raw.color_map()
+    day_slots = spans_to_day_slots(events_raw, lanes, window_start, window_end)
     
     return day_slots, loc_color_map, events_raw
\ No newline at end of file
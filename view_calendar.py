@@ -1,7 +1,9 @@
 import streamlit as st
 import calendar
 import datetime
-from utils import run_query, fetch_and_process_events_for_calendar, EVENT_COLORS
+from event_model import EventTable
+from calendar_render import render_month, render_legend, build_month_html
+from utils import run_query, fetch_and_process_events_for_calendar, calendar_window, EVENT_COLORS
 
 st.title("🗓️ Campus Event Calendar")
 
@@ -101,77 +103,45 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 try:
-    day_slots, loc_color_map, events_raw = fetch_and_process_events_for_calendar()
+    _, loc_color_map, events_raw = fetch_and_process_events_for_calendar(*calendar_window(year, month))
 except Exception as e:
     st.error(f"Error: {e}")
-    day_slots = {}
-    events_raw = []
+    events_raw = EventTable([])
     loc_color_map = {}
 
-cal = calendar.monthcalendar(year, month)
-
 col_cal, col_details = st.columns([3, 1], gap="large")
 
 with col_cal:
-    legend_html = "<div style='margin-bottom: 5px; font-size: 11px;'>"
-    for loc, col in loc_color_map.items():
-        legend_html += f"<span style='margin-right:10px;'><span style='color:{col};'>●</span> {loc}</span>"
-    legend_html += "</div>"
-    st.markdown(legend_html, unsafe_allow_html=True)
-
-    html = "<table class='cal-table'><thead><tr>"
-    for day in ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]:
-        html += f"<th class='cal-th'>{day}</th>"
-    html += "</tr></thead><tbody>"
-
-    for week in cal:
-        html += "<tr>"
-        for day in week:
-            if day == 0:
-                html += "<td class='cal-td cal-empty'></td>"
-            else:
-                current_date = datetime.date(year, month, day)
-                html += f"<td class='cal-td'>"
-                html += f"<span class='cal-day'>{day}</span>"
-                if current_date in day_slots:
-                    slots_for_today = day_slots[current_date]
-                    max_slot = max(slots_for_today.keys()) if slots_for_today else -1
-                    for i in range(max_slot + 1):
-                        if i in slots_for_today:
-                            evt = slots_for_today[i]
-                            style = f"background-color: {evt['color']};"
-                            html += f"<div class='cal-event {evt['type']}' style='{style}' title='{evt['tooltip']}'>{evt['text']}</div>"
-                        else:
-                            html += "<div class='cal-spacer'></div>"
-                html += "</td>"
-        html += "</tr>"
-    html += "</tbody></table>"
+    st.markdown(render_legend(loc_color_map), unsafe_allow_html=True)
+    try:
+        html = render_month(year, month, "full")
+    except Exception:
+        html = build_month_html(year, month, "full", {})
     st.markdown(html, unsafe_allow_html=True)
 
 with col_details:
     st.subheader("📌 Details")
     st.divider()
     
-    current_month_events = [e for e in events_raw if e['start'].month == month and e['start'].year == year]
-    current_month_events.sort(key=lambda x: x['start'])
+    current_month_events = events_raw.in_month(year, month)
     
     if current_month_events:
         for event in current_month_events:
-            color = loc_color_map.get(event['location'], "#555")
+            color = event.color
             with st.container(border=True):
-                s_str = event['dt_start'].strftime('%b %d, %I:%M %p')
-                e_str = event['dt_end'].strftime('%b %d, %I:%M %p')
-                if event['start'] == event['end']:
-                    d_str = f"{s_str} - {event['dt_end'].strftime('%I:%M %p')}"
+                s_str = event.dt_start.strftime('%b %d, %I:%M %p')
+                e_str = event.dt_end.strftime('%b %d, %I:%M %p')
+                if event.start == event.end:
+                    d_str = f"{s_str} - {event.dt_end.strftime('%I:%M %p')}"
                 else:
                     d_str = f"{s_str} - <br>{e_str}"
                 st.markdown(
                     f"<div style='border-left: 4px solid {color}; padding-left: 8px;'>"
                     f"<small>{d_str}</small><br>"
-                    f"<b>{event['name']}</b>"
+                    f"<b>{event.name}</b>"
                     f"</div>", 
                     unsafe_allow_html=True
                 )
-                st.caption(f"📍 {event['location']}")
+                st.caption(f"📍 {event.location}")
     else:
         st.info(f"No events for {month_name}.")
\ No newline at end of file